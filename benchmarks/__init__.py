@@ -0,0 +1,9 @@
+"""
+Бенчмарки FASTA Parser
+
+Модули:
+    generator: Воспроизводимый генератор синтетических FASTA файлов
+    runner: Замеры скорости и памяти, вывод в JSON, сравнение с эталоном
+
+Запуск: python -m benchmarks.runner --output results.json
+"""
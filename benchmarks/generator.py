@@ -0,0 +1,99 @@
+"""
+Генератор синтетических FASTA файлов для бенчмарков
+"""
+
+import random
+
+# Аминокислоты с примерными частотами в белках позвоночных (в процентах)
+_AMINO_ACIDS = "LSAEGVKTPDRIQNFYHMCW"
+_AMINO_WEIGHTS = [9.9, 8.3, 7.0, 7.1, 6.6, 6.0, 5.7, 5.3, 6.3, 4.7,
+                  5.6, 4.3, 4.7, 3.6, 3.6, 2.7, 2.6, 2.1, 2.3, 1.2]
+
+# Нагрузки и их описания
+WORKLOADS = {
+    "reads": "Много коротких прочтений 100-300 bp в одну строку",
+    "chromosomes": "Несколько огромных записей с N-блоками, строки по 60",
+    "mixed_width": "Записи 1-50 kb с шириной строк 50, 60, 70, 80 и без переноса",
+    "proteins": "Белки 50-2000 aa со строками по 60",
+}
+
+
+def _wrap(residues, width):
+    if not width:
+        return residues + "\n"
+    return "".join(residues[i:i + width] + "\n" for i in range(0, len(residues), width))
+
+
+def _dna(rng, length, gc=0.45):
+    at = (1 - gc) / 2
+    return "".join(rng.choices("ACGT", weights=(at, gc / 2, gc / 2, at), k=length))
+
+
+def _reads(rng, size):
+    i = 0
+    while size > 0:
+        residues = _dna(rng, rng.randint(100, 300))
+        yield f"read_{i} length={len(residues)}", residues, 0
+        size -= len(residues)
+        i += 1
+
+
+def _chromosomes(rng, size):
+    count = 3
+    for i in range(count):
+        length = size // count
+        parts = []
+        total = 0
+        while total < length:
+            # Участки с GC от 35% до 60% и редкие блоки N, как в сборках
+            block = min(length - total, rng.randint(10000, 100000))
+            if rng.random() < 0.05:
+                parts.append("N" * block)
+            else:
+                parts.append(_dna(rng, block, rng.uniform(0.35, 0.6)))
+            total += block
+        yield f"chr{i + 1} synthetic chromosome", "".join(parts), 60
+
+
+def _mixed_width(rng, size):
+    i = 0
+    while size > 0:
+        residues = _dna(rng, rng.randint(1000, 50000))
+        yield f"contig_{i}", residues, rng.choice((50, 60, 70, 80, 0))
+        size -= len(residues)
+        i += 1
+
+
+def _proteins(rng, size):
+    i = 0
+    while size > 0:
+        length = rng.randint(50, 2000)
+        residues = "M" + "".join(rng.choices(_AMINO_ACIDS, weights=_AMINO_WEIGHTS, k=length - 1))
+        yield f"sp|P{i:05d}|PROT{i}_SYNTH Synthetic protein {i}", residues, 60
+        size -= length
+        i += 1
+
+
+_GENERATORS = {
+    "reads": _reads,
+    "chromosomes": _chromosomes,
+    "mixed_width": _mixed_width,
+    "proteins": _proteins,
+}
+
+
+def generate(path, workload, size, seed=0):
+    """Пишет в path FASTA нагрузки workload примерно на size остатков.
+
+    Один и тот же seed даёт побайтно тот же файл. Возвращает число записей.
+    """
+    if workload not in _GENERATORS:
+        raise ValueError(f"Неизвестная нагрузка: {workload}")
+    rng = random.Random(f"{workload}:{seed}")
+    count = 0
+    with open(path, "w", encoding="ascii") as f:
+        for header, residues, width in _GENERATORS[workload](rng, size):
+            f.write(f">{header}\n")
+            f.write(_wrap(residues, width))
+            count += 1
+    return count
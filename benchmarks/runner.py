@@ -0,0 +1,169 @@
+"""
+Запуск бенчмарков: скорость, память, JSON и сравнение с эталоном
+
+Каждый замер выполняется в отдельном процессе, чтобы пиковая память
+(ru_maxrss) относилась только к нему.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# Добавляем корень репозитория в путь, чтобы запускать без установки
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import WORKLOADS, generate
+from fasta_parser import FastaReader, FastaWriter
+
+try:
+    import resource
+except ImportError:  # нет на Windows
+    resource = None
+
+
+def _parse(reader, workdir):
+    return sum(1 for _ in reader)
+
+
+def _stats(reader, workdir):
+    return reader.get_file_stats()["sequence_count"]
+
+
+def _scan(reader, workdir):
+    return sum(1 for _ in reader.scan_headers())
+
+
+def _lookup(reader, workdir):
+    """Индекс .fai и 100 случайных поисков по ID."""
+    ids = list(reader.build_index().records)
+    rng = random.Random(0)
+    queries = [rng.choice(ids) for _ in range(100)]
+    for seq_id in queries:
+        reader.get_sequence_by_id(seq_id)
+    return len(queries)
+
+
+def _write(reader, workdir):
+    with FastaWriter(os.path.join(workdir, "written.fasta")) as writer:
+        return writer.write_all(reader)
+
+
+OPERATIONS = {
+    "parse": _parse,
+    "stats": _stats,
+    "scan": _scan,
+    "lookup": _lookup,
+    "write": _write,
+}
+
+
+def _peak_rss():
+    """Пиковая память процесса в байтах или None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # На macOS ru_maxrss в байтах, на Linux — в килобайтах
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(path, operation):
+    """Один замер в текущем процессе: время, МБ/с, записей/с, пиковая память."""
+    with tempfile.TemporaryDirectory() as workdir:
+        reader = FastaReader(path)
+        start = time.perf_counter()
+        records = OPERATIONS[operation](reader, workdir)
+        seconds = time.perf_counter() - start
+    size = os.path.getsize(path)
+    return {
+        "seconds": round(seconds, 4),
+        "mb_per_s": round(size / seconds / 1e6, 2),
+        "records_per_s": round(records / seconds, 1),
+        "peak_rss": _peak_rss(),
+    }
+
+
+def run(workloads, operations, size, seed=0, repeat=3, workdir=None):
+    """Замеры всех пар нагрузка/операция; из repeat повторов берётся лучший."""
+    results = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for workload in workloads:
+            path = os.path.join(tmp, f"{workload}.fasta")
+            generate(path, workload, size, seed)
+            for operation in operations:
+                runs = []
+                for _ in range(repeat):
+                    output = subprocess.run(
+                        [sys.executable, "-m", "benchmarks.runner", "--measure", path, operation],
+                        check=True, capture_output=True, text=True,
+                        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    ).stdout
+                    runs.append(json.loads(output))
+                best = min(runs, key=lambda r: r["seconds"])
+                best["file_size"] = os.path.getsize(path)
+                results[f"{workload}/{operation}"] = best
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": size,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.1):
+    """Регрессии: замеры, где МБ/с упали больше чем на threshold от эталона."""
+    regressions = []
+    for name, base in baseline["results"].items():
+        result = current["results"].get(name)
+        if result is None:
+            continue
+        if result["mb_per_s"] < base["mb_per_s"] * (1 - threshold):
+            regressions.append((name, base["mb_per_s"], result["mb_per_s"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки FASTA Parser")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("--operations", nargs="+", default=list(OPERATIONS), choices=list(OPERATIONS))
+    parser.add_argument("--size", type=int, default=20_000_000, help="остатков в каждом файле")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="куда сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON эталона для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="допустимое падение МБ/с относительно эталона")
+    parser.add_argument("--measure", nargs=2, metavar=("PATH", "OPERATION"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return 0
+
+    current = run(args.workloads, args.operations, args.size, args.seed, args.repeat)
+    for name, result in current["results"].items():
+        rss = result["peak_rss"]
+        rss = f"{rss / 2 ** 20:.0f} MB" if rss else "-"
+        print(f"{name:28} {result['mb_per_s']:10.2f} MB/s "
+              f"{result['records_per_s']:12.1f} rec/s   peak {rss}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"РЕГРЕССИЯ {name}: {before} -> {after} MB/s")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,13 +3,49 @@ FASTA Parser - Python библиотека для работы с биологи
 
 Модули:
     seq: Класс Seq для работы с биологическими последовательностями
+    mapped_seq: Класс MappedSeq — последовательность в отображённом в память файле
+    genetic_code: Генетические коды, комплементарность и трансляция
+    orfs: Поиск открытых рамок считывания
+    packed_seq: Класс PackedSeq — нуклеотиды, упакованные по 2 бита
     fasta_reader: Класс FastaReader для чтения FASTA файлов
+    record: Класс FastaRecord — ленивая ссылка на запись файла
+    fasta_writer: Класс FastaWriter для потоковой записи FASTA
+    multi_reader: Класс MultiFastaReader для параллельного чтения многих файлов
+    metrics: Класс ReaderMetrics со счётчиками чтения
+    cache: Класс SequenceCache — LRU-кэш запросов по ID
+    faidx: Индекс .fai в формате samtools
+    header_index: Индекс заголовков .hidx для поиска по ID и словам
+    bgzf: Чтение и запись BGZF, индекс .gzi
+    tracks: Треки GC и GC-skew по окнам
+    batch: Класс SeqBatch для векторной статистики (нужен numpy)
+    kmers: Подсчёт k-меров (нужен numpy)
+    dedup: Удаление точных повторов последовательностей
+    split: Разбиение файла на части по числу остатков или записей
     exceptions: Пользовательские исключения
 
 """
 
 from .seq import Seq
+from .mapped_seq import MappedSeq
+from .packed_seq import PackedSeq
 from .fasta_reader import FastaReader
+from .fasta_writer import FastaWriter
+from .multi_reader import MultiFastaReader
+from .batch import SeqBatch
+from .metrics import ReaderMetrics
+from .cache import SequenceCache
 from .exceptions import FastaFormatError, InvalidSequenceError
 
-__all__ = ["Seq", "FastaReader", "FastaFormatError", "InvalidSequenceError"]
+__all__ = [
+    "Seq",
+    "MappedSeq",
+    "PackedSeq",
+    "FastaReader",
+    "FastaWriter",
+    "MultiFastaReader",
+    "SeqBatch",
+    "ReaderMetrics",
+    "SequenceCache",
+    "FastaFormatError",
+    "InvalidSequenceError",
+]
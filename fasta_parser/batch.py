@@ -0,0 +1,116 @@
+"""
+Реализация класса SeqBatch
+"""
+
+try:
+    import numpy as np
+except ImportError:  # numpy — необязательная зависимость
+    np = None
+
+from fasta_parser.seq import Seq, _DNA, _PROTEIN, _RNA
+
+# Столбцы матрицы состава: буквы A-Z и последний — все прочие символы
+COLUMNS = tuple("ABCDEFGHIJKLMNOPQRSTUVWXYZ") + ("other",)
+_OTHER = len(COLUMNS) - 1
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Для SeqBatch нужен numpy: pip install numpy")
+
+
+def _column_table():
+    """Таблица байт -> номер столбца матрицы состава."""
+    table = np.full(256, _OTHER, dtype=np.intp)
+    for i, letter in enumerate(COLUMNS[:_OTHER]):
+        table[ord(letter)] = i
+    return table
+
+
+def _outside(letters):
+    """Маска столбцов, не входящих в алфавит letters."""
+    return np.array([column not in letters for column in COLUMNS])
+
+
+class SeqBatch:
+    """Пакет последовательностей в одном непрерывном буфере uint8.
+
+    Остатки всех записей лежат подряд в buffer, границы записи i —
+    offsets[i]:offsets[i + 1]. Длины, состав, GC и тип алфавита
+    считаются векторно по всему пакету сразу.
+    """
+
+    def __init__(self, headers, buffer, offsets):
+        _require_numpy()
+        self.headers = headers
+        self.buffer = buffer
+        self.offsets = offsets
+        self._counts = None
+
+    @classmethod
+    def from_residues(cls, headers, residues):
+        """Пакет из списка заголовков и байтовых строк остатков."""
+        _require_numpy()
+        offsets = np.zeros(len(residues) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in residues], out=offsets[1:])
+        buffer = np.frombuffer(b"".join(residues), dtype=np.uint8)
+        return cls(headers, buffer, offsets)
+
+    @classmethod
+    def from_seqs(cls, seqs):
+        """Пакет из последовательности объектов Seq."""
+        seqs = list(seqs)
+        # Не-ASCII символы заменяются на "?", чтобы длины совпадали с len(seq)
+        residues = [seq.sequence.encode("ascii", "replace") for seq in seqs]
+        return cls.from_residues([seq.header for seq in seqs], residues)
+
+    def __len__(self):
+        return len(self.headers)
+
+    def __getitem__(self, i):
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return Seq(self.buffer[start:end].tobytes().decode("utf-8"), self.headers[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def lengths(self):
+        """Длины всех записей."""
+        return np.diff(self.offsets)
+
+    def counts(self):
+        """Матрица состава: строка на запись, столбцы — COLUMNS."""
+        if self._counts is None:
+            n = len(self)
+            width = len(COLUMNS)
+            record = np.repeat(np.arange(n, dtype=np.intp), self.lengths())
+            flat = np.bincount(record * width + _COLUMN_TABLE[self.buffer], minlength=n * width)
+            self._counts = flat.reshape(n, width)
+        return self._counts
+
+    def alphabet_types(self):
+        """Типы алфавита записей: DNA, RNA, PROTEIN или UNKNOWN."""
+        present = self.counts() > 0
+        types = np.full(len(self), "UNKNOWN", dtype=object)
+        # Идём от общего к частному, как в Seq.alphabet_type
+        for name, outside in (("PROTEIN", _OUTSIDE_PROTEIN), ("RNA", _OUTSIDE_RNA),
+                              ("DNA", _OUTSIDE_DNA)):
+            types[~present[:, outside].any(axis=1)] = name
+        return types.tolist()
+
+    def gc_content(self):
+        """Процент GC каждой записи; NaN для записей не DNA/RNA."""
+        counts = self.counts()
+        gc = counts[:, COLUMNS.index("G")] + counts[:, COLUMNS.index("C")]
+        percent = np.round(100 * gc / self.lengths(), 2)
+        nucleic = np.isin(self.alphabet_types(), ("DNA", "RNA"))
+        percent[~nucleic] = np.nan
+        return percent
+
+
+if np is not None:
+    _COLUMN_TABLE = _column_table()
+    _OUTSIDE_DNA = _outside(_DNA)
+    _OUTSIDE_RNA = _outside(_RNA)
+    _OUTSIDE_PROTEIN = _outside(_PROTEIN)
@@ -0,0 +1,290 @@
+"""
+Сжатые FASTA: чтение gzip и BGZF, запись BGZF, индекс .gzi
+"""
+
+import io
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# ID1 ID2 CM FLG с флагом FEXTRA — так начинается каждый блок BGZF
+_BGZF_MAGIC = b"\x1f\x8b\x08\x04"
+_HEADER_SIZE = 18
+_TRAILER = struct.Struct("<II")
+
+# Данных в одном блоке: как в htslib, чтобы сжатый блок уложился в 64 КБ
+BLOCK_DATA_SIZE = 0xFF00
+
+
+def thread_count(threads=None):
+    """Число потоков распаковки: threads или min(8, число ядер)."""
+    return threads or min(8, os.cpu_count() or 1)
+
+
+def detect_compression(path):
+    """Тип сжатия по магическим байтам: None, "gzip" или "bgzf"."""
+    with open(path, "rb") as f:
+        head = f.read(_HEADER_SIZE)
+    if head[:2] != GZIP_MAGIC:
+        return None
+    # BGZF — это gzip, в extra-поле которого записан подполе "BC" с размером блока
+    if head[:4] == _BGZF_MAGIC and head[12:14] == b"BC":
+        return "bgzf"
+    return "gzip"
+
+
+def _read_block(f):
+    """Читает очередной сжатый блок целиком; None в конце файла."""
+    header = f.read(_HEADER_SIZE)
+    if not header:
+        return None
+    if len(header) < _HEADER_SIZE or header[:4] != _BGZF_MAGIC or header[12:14] != b"BC":
+        raise OSError("Некорректный блок BGZF")
+    block_size = int.from_bytes(header[16:18], "little") + 1
+    return header + f.read(block_size - _HEADER_SIZE)
+
+
+def _inflate(block):
+    """Распаковывает блок и проверяет CRC32 и длину."""
+    extra_size = int.from_bytes(block[10:12], "little")
+    data = zlib.decompress(block[12 + extra_size:-8], -15)
+    crc, size = _TRAILER.unpack(block[-8:])
+    if zlib.crc32(data) != crc or len(data) != size:
+        raise OSError("Повреждённый блок BGZF: не сходится CRC32")
+    return data
+
+
+def _deflate(data, level=6):
+    """Сжимает data в один блок BGZF."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+    header = _BGZF_MAGIC + b"\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+    return (header + struct.pack("<H", len(cdata) + 25) + cdata
+            + _TRAILER.pack(zlib.crc32(data), len(data)))
+
+
+class GziIndex:
+    """Индекс .gzi: начала блоков в сжатом и распакованном файле."""
+
+    def __init__(self, entries):
+        entries = sorted(set(entries) | {(0, 0)})
+        self.compressed = [c for c, _ in entries]
+        self.uncompressed = [u for _, u in entries]
+
+    def __len__(self):
+        return len(self.compressed)
+
+    @classmethod
+    def build(cls, path):
+        """Строит индекс, читая только заголовки и длины блоков."""
+        entries = []
+        compressed = uncompressed = 0
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(_HEADER_SIZE)
+                if not header:
+                    break
+                if len(header) < _HEADER_SIZE or header[:4] != _BGZF_MAGIC:
+                    raise OSError("Некорректный блок BGZF")
+                block_size = int.from_bytes(header[16:18], "little") + 1
+                # Длина распакованных данных — последние 4 байта блока
+                f.seek(compressed + block_size - 4)
+                entries.append((compressed, uncompressed))
+                uncompressed += int.from_bytes(f.read(4), "little")
+                compressed += block_size
+        return cls(entries)
+
+    @classmethod
+    def read(cls, path):
+        """Загружает индекс в формате htslib: число записей и пары uint64."""
+        with open(path, "rb") as f:
+            count = struct.unpack("<Q", f.read(8))[0]
+            values = struct.unpack(f"<{2 * count}Q", f.read(16 * count))
+        return cls(zip(values[::2], values[1::2]))
+
+    def write(self, path):
+        """Сохраняет индекс; первый блок (0, 0), как в htslib, не пишется."""
+        pairs = list(zip(self.compressed[1:], self.uncompressed[1:]))
+        with open(path, "wb") as f:
+            f.write(struct.pack("<Q", len(pairs)))
+            for pair in pairs:
+                f.write(struct.pack("<QQ", *pair))
+
+    def locate(self, pos):
+        """Блок, содержащий распакованную позицию pos: (смещение блока, сдвиг в нём)."""
+        i = bisect_right(self.uncompressed, pos) - 1
+        return self.compressed[i], pos - self.uncompressed[i]
+
+
+class BgzfReader(io.RawIOBase):
+    """Поток распакованных данных BGZF.
+
+    Блоки распаковываются параллельно в пуле потоков (zlib отпускает GIL)
+    с ограниченным забеганием вперёд. seek() по распакованной позиции
+    использует индекс .gzi и распаковывает только нужные блоки: блок
+    позиции — сразу, а забегание вперёд начинается, только если чтение
+    продолжается дальше, и растёт постепенно.
+
+    executor — общий пул потоков (например, один на FastaReader); он не
+    закрывается вместе с потоком. Без него пул создаётся свой.
+    """
+
+    def __init__(self, path, threads=None, index=None, executor=None):
+        super().__init__()
+        self._file = open(path, "rb")
+        self._threads = thread_count(threads)
+        self._own_executor = executor is None and self._threads > 1
+        if self._own_executor:
+            executor = ThreadPoolExecutor(self._threads)
+        self._executor = executor if self._threads > 1 else None
+        self.index = index
+        self._blocks = self._inflate_from(0)
+        self._data = b""
+        self._data_pos = 0
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def readinto(self, buffer):
+        while self._data_pos >= len(self._data):
+            data = next(self._blocks, None)
+            if data is None:
+                return 0
+            self._data, self._data_pos = data, 0
+        n = min(len(buffer), len(self._data) - self._data_pos)
+        buffer[:n] = self._data[self._data_pos:self._data_pos + n]
+        self._data_pos += n
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("BGZF поддерживает seek только от начала")
+        if self.index is None:
+            self.index = GziIndex.build(self._file.name)
+        block_offset, within = self.index.locate(offset)
+        self._blocks.close()
+        self._blocks = self._inflate_from(block_offset)
+        self._data = next(self._blocks, b"")
+        self._data_pos = within
+        self._pos = offset
+        return offset
+
+    def _inflate_from(self, block_offset):
+        """Генератор распакованных блоков начиная с block_offset.
+
+        Первый блок распаковывается сразу. Дальше в пул отправляется
+        окно блоков, которое удваивается с каждым выданным блоком до
+        threads * 4, так что короткое чтение после seek() не распаковывает
+        лишнего.
+        """
+        self._file.seek(block_offset)
+        blocks = iter(lambda: _read_block(self._file), None)
+        block = next(blocks, None)
+        if block is None:
+            return
+        yield _inflate(block)
+        if self._executor is None:
+            for block in blocks:
+                yield _inflate(block)
+            return
+        pending = deque()
+        window = 1
+        for block in blocks:
+            pending.append(self._executor.submit(_inflate, block))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+                window = min(window * 2, self._threads * 4)
+        while pending:
+            yield pending.popleft().result()
+
+    def close(self):
+        if not self.closed:
+            self._blocks.close()
+            self._file.close()
+            if self._own_executor:
+                self._executor.shutdown(wait=False)
+        super().close()
+
+
+class BgzfWriter:
+    """Запись BGZF: блоки сжимаются параллельно и пишутся по порядку.
+
+    По ходу записи собирается индекс .gzi (атрибут index после close).
+    """
+
+    def __init__(self, path, threads=None, level=6):
+        self._file = open(path, "wb")
+        self._threads = thread_count(threads)
+        self._executor = ThreadPoolExecutor(self._threads) if self._threads > 1 else None
+        self._level = level
+        self._pending = deque()
+        self._data = bytearray()
+        self._entries = []
+        self._compressed = 0
+        self._uncompressed = 0
+        self.index = None
+
+    def write(self, data):
+        self._data += data
+        if len(self._data) >= BLOCK_DATA_SIZE:
+            view = memoryview(self._data)
+            end = len(self._data) - len(self._data) % BLOCK_DATA_SIZE
+            for start in range(0, end, BLOCK_DATA_SIZE):
+                self._submit(bytes(view[start:start + BLOCK_DATA_SIZE]))
+            view.release()
+            del self._data[:end]
+        return len(data)
+
+    def _submit(self, data):
+        if self._executor is None:
+            self._write_block(_deflate(data, self._level), len(data))
+            return
+        self._pending.append((self._executor.submit(_deflate, data, self._level), len(data)))
+        while len(self._pending) >= self._threads * 4:
+            self._write_pending()
+
+    def _write_pending(self):
+        future, size = self._pending.popleft()
+        self._write_block(future.result(), size)
+
+    def _write_block(self, block, size):
+        self._entries.append((self._compressed, self._uncompressed))
+        self._file.write(block)
+        self._compressed += len(block)
+        self._uncompressed += size
+
+    def close(self):
+        """Дописывает остаток, пустой блок-маркер конца файла и закрывает файл."""
+        if self._file.closed:
+            return
+        if self._data:
+            self._submit(bytes(self._data))
+            self._data.clear()
+        while self._pending:
+            self._write_pending()
+        self._write_block(_deflate(b""), 0)
+        self._file.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+        self.index = GziIndex(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,92 @@
+"""
+Кэш последовательностей для повторных запросов по ID
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+
+def file_key(path):
+    """Часть ключа кэша, меняющаяся вместе с файлом: (путь, inode, mtime в нс)."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_ino, stat.st_mtime_ns
+
+
+def _size(seq):
+    """Примерный объём Seq в памяти, байтов."""
+    return sys.getsizeof(seq) + sys.getsizeof(seq.sequence) + sys.getsizeof(seq.header)
+
+
+class SequenceCache:
+    """Потокобезопасный LRU-кэш Seq с ограничением по объёму в байтах.
+
+    Передаётся в FastaReader(cache=...) и может быть общим для многих
+    читателей и потоков. Ключ включает inode и mtime файла, поэтому
+    после изменения файла старые записи не находятся и со временем
+    вытесняются. Seq больше max_bytes не кэшируются. Выданные Seq общие
+    для всех запросов — изменять их нельзя.
+    """
+
+    def __init__(self, max_bytes=64 << 20):
+        if max_bytes < 0:
+            raise ValueError("Объём кэша не может быть отрицательным")
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Seq по ключу или None; найденная запись становится самой свежей."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, seq):
+        """Кладёт seq в кэш, вытесняя давно не использованные записи."""
+        size = _size(seq)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (seq, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        """Удаляет все записи; счётчики сохраняются."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Счётчики кэша в виде словаря."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
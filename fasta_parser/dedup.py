@@ -0,0 +1,308 @@
+"""
+Удаление точных повторов последовательностей с ограниченной памятью
+"""
+
+import hashlib
+import heapq
+import itertools
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+
+from fasta_parser.fasta_reader import _UPPER, _WHITESPACE, _iter_records, _make_seq, _seq_from_body
+from fasta_parser.fasta_writer import FastaWriter
+
+# Размер дайджеста blake2b в байтах: вероятность случайного совпадения
+# для 10^9 записей порядка 10^-21
+DIGEST_SIZE = 16
+
+# Записей прогона, читаемых с диска за раз
+_READ_ENTRIES = 1 << 12
+
+# Наибольшее число прогонов на диске: столько файлов открыто при слиянии
+_MAX_RUNS = 64
+
+
+def _digest(body):
+    """Дайджест нормализованной последовательности из сырых байтов тела записи."""
+    data = body.translate(_UPPER, _WHITESPACE)
+    if not data or not data.isascii():
+        # Пустые и не-ASCII записи нормализуются так же, как при чтении в Seq
+        data = _seq_from_body(body, "").sequence.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+class _DigestTable:
+    """Хеш-таблица дайджест -> номера записей в плоских массивах.
+
+    Ключи лежат подряд в bytearray, поиск — открытая адресация с
+    линейным пробированием. Номера записей с одинаковым дайджестом
+    связаны в список через массив links, так что на запись приходится
+    16 байтов, а на уникальный дайджест — ещё от 48 до 96.
+
+    Домашний слот — старшие биты дайджеста, поэтому слоты идут в порядке
+    дайджестов с точностью до сдвига внутри кластера занятых слотов:
+    для сортировки достаточно упорядочить каждый кластер отдельно.
+    """
+
+    def __init__(self, capacity=1 << 10):
+        self.ordinals = array("q")
+        self.links = array("q")
+        self.size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.keys = bytearray(DIGEST_SIZE * capacity)
+        self.heads = array("q", [-1]) * capacity
+
+    def _home(self, digest):
+        return int.from_bytes(digest[:8], "big") >> self.shift
+
+    def _slot(self, digest):
+        """Слот дайджеста: занятый им или первый свободный."""
+        keys, heads, mask = self.keys, self.heads, self.mask
+        slot = self._home(digest)
+        while heads[slot] >= 0 and keys[slot * DIGEST_SIZE:(slot + 1) * DIGEST_SIZE] != digest:
+            slot = (slot + 1) & mask
+        return slot
+
+    def add(self, digest, ordinal):
+        """Добавляет запись с номером ordinal."""
+        slot = self._slot(digest)
+        head = self.heads[slot]
+        if head < 0:
+            self.keys[slot * DIGEST_SIZE:(slot + 1) * DIGEST_SIZE] = digest
+            self.size += 1
+        self.links.append(head)
+        self.heads[slot] = len(self.ordinals)
+        self.ordinals.append(ordinal)
+        if self.size * 2 > self.capacity:
+            self._grow()
+
+    def _grow(self):
+        keys, heads = self.keys, self.heads
+        self._allocate(self.capacity * 2)
+        for slot, head in enumerate(heads):
+            if head >= 0:
+                digest = bytes(keys[slot * DIGEST_SIZE:(slot + 1) * DIGEST_SIZE])
+                new = self._slot(digest)
+                self.keys[new * DIGEST_SIZE:(new + 1) * DIGEST_SIZE] = digest
+                self.heads[new] = head
+
+    def peak_nbytes(self):
+        """Наибольший объём таблицы при добавлении ещё одной записи.
+
+        Если добавление удвоит таблицу, учитываются и старые, и новые
+        массивы слотов: во время перестройки живы оба.
+        """
+        slots = (DIGEST_SIZE + self.heads.itemsize) * self.capacity
+        if (self.size + 1) * 2 > self.capacity:
+            slots *= 3
+        return slots + self.ordinals.itemsize * (len(self.ordinals) + 1) * 2
+
+    def _cluster(self, slots):
+        """Дайджесты слотов кластера по возрастанию вместе с головами списков."""
+        keys, heads = self.keys, self.heads
+        return sorted((bytes(keys[slot * DIGEST_SIZE:(slot + 1) * DIGEST_SIZE]), heads[slot])
+                      for slot in slots)
+
+    def _clusters(self):
+        """Кластеры занятых слотов в порядке дайджестов.
+
+        Кластер, переходящий через конец таблицы, начинается в слоте 0
+        дайджестами, чей домашний слот в конце таблицы; они выдаются
+        вместе с последним кластером.
+        """
+        heads, capacity = self.heads, self.capacity
+        slot = 0
+        while slot < capacity and heads[slot] >= 0:
+            slot += 1
+        lead = self._cluster(range(slot))
+        wrapped = [entry for entry in lead if self._home(entry[0]) >= slot]
+        yield [entry for entry in lead if self._home(entry[0]) < slot]
+        cluster = []
+        for slot in range(slot, capacity):
+            if heads[slot] >= 0:
+                cluster.append(slot)
+            elif cluster:
+                yield self._cluster(cluster)
+                cluster = []
+        yield sorted(self._cluster(cluster) + wrapped)
+
+    def entries(self):
+        """Пары (дайджест, номер записи) по возрастанию.
+
+        Сортируются только отдельные кластеры, так что дополнительная
+        память не зависит от размера таблицы.
+        """
+        links, ordinals = self.links, self.ordinals
+        for cluster in self._clusters():
+            for digest, head in cluster:
+                chain = []
+                while head >= 0:
+                    chain.append(ordinals[head])
+                    head = links[head]
+                for ordinal in reversed(chain):
+                    yield digest, ordinal
+
+
+class _Runs:
+    """Отсортированные прогоны записей фиксированного формата во временном каталоге."""
+
+    def __init__(self, fmt, spill_dir=None):
+        self.entry = struct.Struct(fmt)
+        self.spill_dir = spill_dir
+        self.directory = None
+        self.paths = []
+        self.count = 0
+
+    def write(self, entries):
+        """Сохраняет отсортированные entries отдельным прогоном.
+
+        Когда прогонов набирается _MAX_RUNS, они сливаются в один.
+        """
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix="dedup-", dir=self.spill_dir)
+        self.paths.append(self._write(entries))
+        if len(self.paths) >= _MAX_RUNS:
+            paths = self.paths
+            self.paths = [self._write(heapq.merge(*[self._read(path) for path in paths]))]
+            for path in paths:
+                os.remove(path)
+
+    def _write(self, entries):
+        self.count += 1
+        path = os.path.join(self.directory, f"{self.count}.run")
+        pack = self.entry.pack
+        limit = self.entry.size * _READ_ENTRIES
+        buffer = bytearray()
+        with open(path, "wb") as f:
+            for entry in entries:
+                buffer += pack(*entry)
+                if len(buffer) >= limit:
+                    f.write(buffer)
+                    buffer.clear()
+            f.write(buffer)
+        return path
+
+    def _read(self, path):
+        size = self.entry.size * _READ_ENTRIES
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(size)
+                if not chunk:
+                    return
+                yield from self.entry.iter_unpack(chunk)
+
+    def merge(self, entries=()):
+        """Слияние всех прогонов и отсортированных entries из памяти."""
+        return heapq.merge(*[self._read(path) for path in self.paths], entries)
+
+    def close(self):
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+
+def _hash_records(reader, memory_limit, runs):
+    """Первый проход: дайджесты всех записей; возвращает таблицу в памяти и число записей.
+
+    Если следующая запись (вместе с возможным удвоением таблицы) вывела
+    бы таблицу за memory_limit байтов, таблица сначала сбрасывается на
+    диск отсортированным прогоном и начинается заново.
+    """
+    table = _DigestTable()
+    ordinal = 0
+    with reader._open() as f:
+        for _, body in _iter_records(f, reader.block_size):
+            if table.size and table.peak_nbytes() > memory_limit:
+                runs.write(table.entries())
+                table = _DigestTable()
+            table.add(_digest(body), ordinal)
+            ordinal += 1
+    return table, ordinal
+
+
+def _group_pairs(entries, memory_limit, runs):
+    """Пары (номер записи, группа) для повторяющихся последовательностей по номеру записи.
+
+    Группа — номер первой записи с той же последовательностью. Пары
+    копятся в памяти и при превышении лимита сбрасываются прогонами.
+    """
+    limit = max(memory_limit // 128, 1)
+    pairs = []
+    for _, group in itertools.groupby(entries, key=lambda entry: entry[0]):
+        ordinals = [ordinal for _, ordinal in group]
+        if len(ordinals) < 2:
+            continue
+        first = ordinals[0]
+        pairs.extend((ordinal, first) for ordinal in ordinals)
+        if len(pairs) >= limit:
+            pairs.sort()
+            runs.write(pairs)
+            pairs = []
+    pairs.sort()
+    return runs.merge(pairs)
+
+
+def deduplicate(reader, output, groups=None, memory_limit=1 << 30, spill_dir=None,
+                line_width=60, bgzf=False, index=False):
+    """Пишет в output записи reader без точных повторов последовательностей.
+
+    Последовательность сравнивается после нормализации (верхний регистр,
+    без пробельных символов) по дайджесту blake2b; из повторов остаётся
+    первая запись, порядок записей сохраняется. Если задан groups, туда
+    пишется TSV групп повторов: строки «группа, номер записи, заголовок»
+    в порядке файла, где группа — номер оставленной записи (с нуля).
+
+    Файл читается дважды. Дайджесты хранятся в компактной хеш-таблице;
+    если она превысила бы memory_limit байтов, таблица сбрасывается в
+    spill_dir отсортированными прогонами, которые затем сливаются.
+    Сверх лимита нужны только буферы чтения и записи постоянного размера.
+    Возвращает словарь со счётчиками records, unique, duplicates и groups.
+    """
+    digest_runs = _Runs(f">{DIGEST_SIZE}sq", spill_dir)
+    pair_runs = _Runs(">qq", spill_dir)
+    try:
+        table, records = _hash_records(reader, memory_limit, digest_runs)
+        # Пока пары копятся, последняя таблица ещё в памяти: им остаётся разница
+        pairs = _group_pairs(digest_runs.merge(table.entries()),
+                             max(memory_limit - table.peak_nbytes(), 0), pair_runs)
+        del table
+        duplicates = 0
+        group_count = 0
+        pair = next(pairs, None)
+        group_file = open(groups, "w", encoding="utf-8") if groups else None
+        try:
+            with FastaWriter(output, line_width, bgzf=bgzf, index=index) as writer, \
+                    reader._open() as f:
+                for ordinal, (header, body) in enumerate(_iter_records(f, reader.block_size)):
+                    if pair is None or pair[0] != ordinal:
+                        writer.write(_make_seq(header, body))
+                        continue
+                    group = pair[1]
+                    pair = next(pairs, None)
+                    if group == ordinal:
+                        group_count += 1
+                        writer.write(_make_seq(header, body))
+                    else:
+                        duplicates += 1
+                    if group_file is not None:
+                        group_file.write(f"{group}\t{ordinal}\t{header.decode('utf-8').rstrip()}\n")
+        finally:
+            if group_file is not None:
+                group_file.close()
+    finally:
+        digest_runs.close()
+        pair_runs.close()
+    return {
+        "records": records,
+        "unique": records - duplicates,
+        "duplicates": duplicates,
+        "groups": group_count,
+    }
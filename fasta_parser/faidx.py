@@ -0,0 +1,138 @@
+"""
+Индекс FASTA-файла в формате samtools .fai
+"""
+
+from collections import namedtuple
+
+from fasta_parser.exceptions import FastaFormatError
+
+
+class FaiRecord(namedtuple("FaiRecord", "name length offset line_bases line_width")):
+    """Строка .fai: имя, длина, смещение первого остатка, остатков и байтов в строке."""
+
+    __slots__ = ()
+
+    def byte_offset(self, pos):
+        """Смещение в файле для позиции pos внутри последовательности."""
+        if not self.line_bases:
+            return self.offset + pos
+        return self.offset + pos // self.line_bases * self.line_width + pos % self.line_bases
+
+    def byte_range(self, start, end):
+        """Диапазон байтов файла, покрывающий остатки [start, end)."""
+        if start >= end:
+            return self.offset, self.offset
+        return self.byte_offset(start), self.byte_offset(end - 1) + 1
+
+
+class FastaIndex:
+    """Индекс .fai: имя записи -> FaiRecord."""
+
+    def __init__(self, records=()):
+        self.records = {}
+        for record in records:
+            # Как и samtools, при повторе имени оставляем первую запись
+            self.records.setdefault(record.name, record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records.values())
+
+    def __contains__(self, name):
+        return name in self.records
+
+    def __getitem__(self, name):
+        return self.records[name]
+
+    @classmethod
+    def build(cls, f):
+        """Строит индекс по двоичному файловому объекту за один проход."""
+        records = []
+        name = None
+        offset = pos = 0
+        for line_no, line in enumerate(f, 1):
+            size = len(line)
+            if line[:1] == b">":
+                if name:
+                    records.append(FaiRecord(name, length, offset, line_bases, line_width))
+                fields = line[1:].split()
+                name = fields[0].decode("utf-8") if fields else None
+                offset = pos + size
+                length = line_bases = line_width = 0
+                short = False
+            elif name:
+                bases = len(line.rstrip(b"\r\n"))
+                if not bases:
+                    short = True
+                elif short:
+                    raise FastaFormatError(
+                        f"Разная длина строк в последовательности {name}", line_no
+                    )
+                elif not line_bases:
+                    line_bases, line_width = bases, size
+                elif bases > line_bases:
+                    raise FastaFormatError(
+                        f"Разная длина строк в последовательности {name}", line_no
+                    )
+                elif bases < line_bases or size != line_width:
+                    # Короче может быть только последняя строка записи
+                    short = True
+                length += bases
+            pos += size
+        if name:
+            records.append(FaiRecord(name, length, offset, line_bases, line_width))
+        return cls(records)
+
+    @classmethod
+    def read(cls, path):
+        """Загружает индекс из .fai файла."""
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 5:
+                    raise FastaFormatError("Некорректная строка .fai", line_no)
+                records.append(FaiRecord(fields[0], *map(int, fields[1:5])))
+        return cls(records)
+
+    def write(self, path):
+        """Сохраняет индекс в .fai файл."""
+        with open(path, "w", encoding="utf-8") as f:
+            for r in self.records.values():
+                f.write(f"{r.name}\t{r.length}\t{r.offset}\t{r.line_bases}\t{r.line_width}\n")
+
+
+def read_header(f, record, chunk_size=4096):
+    """Читает строку заголовка, стоящую перед последовательностью record."""
+    end = record.offset
+    data = b""
+    while True:
+        start = max(0, end - chunk_size)
+        f.seek(start)
+        data = f.read(end - start) + data
+        # Последний байт data — перевод строки после заголовка
+        pos = data.rfind(b"\n>", 0, len(data) - 1)
+        if pos != -1:
+            return data[pos + 2:].decode("utf-8").rstrip()
+        if start == 0:
+            return data[1:].decode("utf-8").rstrip()
+        end = start
+
+
+def header_at(buffer, record):
+    """Строка заголовка записи record в отображённом в память файле."""
+    start = buffer.rfind(b"\n>", 0, record.offset - 1) + 2
+    if start == 1:
+        start = 1 if buffer[:1] == b">" else 0
+    return buffer[start:record.offset].decode("utf-8").rstrip()
+
+
+def read_sequence(f, record, start=0, end=None):
+    """Читает остатки [start, end) записи record, не трогая остальной файл."""
+    if end is None or end > record.length:
+        end = record.length
+    first, last = record.byte_range(start, end)
+    f.seek(first)
+    return f.read(last - first).translate(None, b"\r\n")
@@ -2,18 +2,527 @@
 Реализация класса FastaReader
 """
 
+import asyncio
+import gzip
+import io
+import itertools
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from fasta_parser.bgzf import BgzfReader, GziIndex, detect_compression, thread_count
+from fasta_parser.cache import file_key
+from fasta_parser.faidx import FastaIndex, header_at, read_header, read_sequence
+from fasta_parser.fasta_writer import FastaWriter
+from fasta_parser.header_index import HeaderIndex
+from fasta_parser.mapped_seq import MappedSeq
 from fasta_parser.seq import Seq
 
+# Размер блока, которым читается файл в движке "block"
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# Байты, которые выбрасываются из тела записи
+_WHITESPACE = b" \t\r\n\v\f"
+
+# Пробельные символы, кроме перевода строки
+_OTHER_WHITESPACE = (b" ", b"\t", b"\r", b"\v", b"\f")
+
+# Перевод в верхний регистр вместе с удалением _WHITESPACE за один translate
+_UPPER = bytes.maketrans(b"abcdefghijklmnopqrstuvwxyz", b"ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+class _RecordParser:
+    """Выделяет из потока двоичных блоков целые записи.
+
+    feed() выдаёт тройки (offset, header, body) для завершённых записей,
+    close() — для последней записи. Граница записи — перевод строки,
+    за которым сразу идёт ">"; она ищется через bytes.find прямо в блоке.
+    Если задан stop, записи, начинающиеся на смещении stop и дальше,
+    не выдаются.
+    """
+
+    def __init__(self, pos=0, stop=None):
+        self.pos = pos
+        self._stop = stop
+        self._line_start = True
+        # Незавершённый кусок файла: начало записи или текст до первой записи
+        self._parts = []
+        self._offset = pos
+        self.done = False
+
+    def feed(self, block):
+        if self.done:
+            return
+        pos = self.pos
+        self.pos += len(block)
+        if self._line_start and block[:1] == b">":
+            start = 0
+        else:
+            start = block.find(b"\n>")
+            if start != -1:
+                start += 1
+        self._line_start = block[-1:] == b"\n"
+        if start == -1:
+            self._parts.append(block)
+            return
+        if start:
+            self._parts.append(block[:start])
+        yield from self._flush()
+        stop = self._stop
+        while True:
+            if stop is not None and pos + start >= stop:
+                self.done = True
+                return
+            end = block.find(b"\n>", start)
+            if end == -1:
+                break
+            nl = block.find(b"\n", start)
+            yield pos + start, block[start + 1:nl], block[nl + 1:end + 1]
+            start = end + 1
+        self._parts = [block[start:]]
+        self._offset = pos + start
+
+    def close(self):
+        if not self.done:
+            yield from self._flush()
+        self.done = True
+
+    def _flush(self):
+        chunk = b"".join(self._parts)
+        self._parts = []
+        if chunk[:1] != b">":
+            return
+        nl = chunk.find(b"\n")
+        if nl == -1:
+            yield self._offset, chunk[1:], b""
+        else:
+            yield self._offset, chunk[1:nl], chunk[nl + 1:]
+
+
+def _read_blocks(f, block_size):
+    """Генератор двоичных блоков файла."""
+    while True:
+        block = f.read(block_size)
+        if not block:
+            return
+        yield block
+
+
+def _make_seq(header, body):
+    """Строит Seq из сырых байтов заголовка и тела записи."""
+    return _seq_from_body(body, header.decode("utf-8").rstrip())
+
+
+def _seq_from_body(body, header):
+    """Seq из сырых байтов тела записи.
+
+    Регистр и пробельные символы обрабатываются одним translate, а
+    строка передаётся в Seq без повторной нормализации.
+    """
+    data = body.translate(_UPPER, _WHITESPACE)
+    if not data.isascii():
+        # str.upper знает и не-ASCII буквы, поэтому такие записи идут обычным путём
+        return Seq(data.decode("utf-8"), header)
+    if not data:
+        raise ValueError("Последовательность не может быть пустой")
+    return Seq._from_normalized(data.decode("ascii"), header)
+
+
+def _iter_records(f, block_size, start=0, stop=None):
+    """Генератор сырых пар (header, body) записей с непустым заголовком."""
+    parser = _RecordParser(start, stop)
+    for block in _read_blocks(f, block_size):
+        for _, header, body in parser.feed(block):
+            if header.strip():
+                yield header, body
+        if parser.done:
+            return
+    for _, header, body in parser.close():
+        if header.strip():
+            yield header, body
+
+
+def _iter_seqs(f, block_size, start=0, stop=None):
+    """Генератор Seq из двоичного файла, начиная с записи на смещении start."""
+    for header, body in _iter_records(f, block_size, start, stop):
+        yield _make_seq(header, body)
+
+
+async def _aiter_seqs(next_block, executor, read_ahead):
+    """Асинхронный генератор Seq из блоков, которые отдаёт корутина next_block.
+
+    Блоки разбираются в executor (в одном потоке, по порядку), готовые
+    записи передаются через очередь из read_ahead блоков, так что цикл
+    событий не блокируется, а вперёд читается не больше read_ahead блоков.
+    """
+    loop = asyncio.get_running_loop()
+    parser = _RecordParser()
+    queue = asyncio.Queue(read_ahead)
+
+    def parse(block):
+        records = parser.feed(block) if block else parser.close()
+        return [_make_seq(header, body) for _, header, body in records if header.strip()]
+
+    async def produce():
+        try:
+            while True:
+                block = await next_block()
+                await queue.put(await loop.run_in_executor(executor, parse, block))
+                if not block:
+                    await queue.put(None)
+                    return
+        except Exception as exc:
+            await queue.put(exc)
+
+    task = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            for seq in item:
+                yield seq
+    finally:
+        task.cancel()
+
+
+def _scan_records(blocks):
+    """Генератор (offset, end, header, length) без сборки тел записей.
+
+    offset и end — границы записи в файле вместе со строкой заголовка.
+    Остатки считаются прямо в блоках как длина куска без пробельных
+    символов, поэтому в памяти держится только текущий блок и заголовок.
+    """
+    pos = 0
+    line_start = True
+    in_header = False
+    # None — ещё не встретилась ни одна запись (текст до первого ">")
+    header = None
+    offset = length = 0
+    for block in blocks:
+        n = len(block)
+        # Обычно из пробельных символов в блоке есть только "\n": тогда
+        # остатки считаются через bytes.count без копирования кусков
+        plain = all(block.find(c) == -1 for c in _OTHER_WHITESPACE)
+        i = 0
+        if in_header:
+            nl = block.find(b"\n")
+            if nl == -1:
+                header += block
+                pos += n
+                continue
+            header += block[:nl]
+            in_header = False
+            line_start = True
+            i = nl + 1
+        if line_start and block[i:i + 1] == b">":
+            start = i
+        else:
+            start = block.find(b"\n>", i)
+            if start != -1:
+                start += 1
+        while True:
+            if header is not None:
+                end = n if start == -1 else start
+                if plain:
+                    length += end - i - block.count(b"\n", i, end)
+                else:
+                    length += len(block[i:end].translate(None, _WHITESPACE))
+            if start == -1:
+                break
+            if header is not None and header.strip():
+                yield offset, pos + start, header, length
+            offset = pos + start
+            length = 0
+            nl = block.find(b"\n", start)
+            if nl == -1:
+                header = block[start + 1:]
+                in_header = True
+                break
+            header = block[start + 1:nl]
+            i = nl + 1
+            start = block.find(b"\n>", nl)
+            if start != -1:
+                start += 1
+        line_start = block[-1:] == b"\n"
+        pos += n
+    if header is not None and header.strip():
+        yield offset, pos, header, length
+
+
+def _iter_fragments(blocks):
+    """Генератор фрагментов записей: (header, None) в начале записи и
+    (None, piece) для кусков её тела.
+
+    Куски тела — срезы прочитанных блоков с пробельными символами, так
+    что запись любой длины не собирается в памяти целиком.
+    """
+    line_start = True
+    in_record = False
+    # Байты заголовка, пока он читается, иначе None
+    header = None
+    for block in blocks:
+        i = 0
+        n = len(block)
+        while i < n:
+            if header is not None:
+                nl = block.find(b"\n", i)
+                if nl == -1:
+                    header += block[i:]
+                    break
+                yield header + block[i:nl], None
+                header = None
+                in_record = True
+                line_start = True
+                i = nl + 1
+                continue
+            if line_start and block[i:i + 1] == b">":
+                start = i
+            else:
+                start = block.find(b"\n>", i)
+                if start != -1:
+                    start += 1
+            end = n if start == -1 else start
+            if in_record and end > i:
+                yield None, block[i:end]
+            if start == -1:
+                line_start = block[-1:] == b"\n"
+                break
+            header = b""
+            i = start + 1
+    if header is not None:
+        yield header, None
+
+
+def _find_record_start(f, pos, block_size):
+    """Смещение первой записи, начинающейся на позиции pos или позже."""
+    if pos == 0:
+        return 0
+    # Начинаем на байт раньше, чтобы увидеть перевод строки перед ">"
+    f.seek(pos - 1)
+    tail = b""
+    base = pos - 1
+    for block in _read_blocks(f, block_size):
+        data = tail + block
+        found = data.find(b"\n>")
+        if found != -1:
+            return base + found + 1
+        tail = data[-1:]
+        base += len(data) - 1
+    return base + len(tail)
+
+
+def _collect_stats(seqs):
+    """Статистика по последовательностям: число, длины и типы алфавита."""
+    count = total = 0
+    min_length = max_length = None
+    alphabet_types = {}
+    for seq in seqs:
+        length = len(seq)
+        count += 1
+        total += length
+        if min_length is None or length < min_length:
+            min_length = length
+        if max_length is None or length > max_length:
+            max_length = length
+        atype = seq.alphabet_type()
+        alphabet_types[atype] = alphabet_types.get(atype, 0) + 1
+    return {
+        "sequence_count": count,
+        "total_length": total,
+        "min_length": min_length or 0,
+        "max_length": max_length or 0,
+        "alphabet_types": alphabet_types,
+    }
+
+
+def _merge_stats(parts):
+    """Объединяет статистики диапазонов, взятые в порядке следования в файле."""
+    merged = _collect_stats(())
+    for part in parts:
+        if not part["sequence_count"]:
+            continue
+        if not merged["sequence_count"]:
+            merged["min_length"] = part["min_length"]
+        merged["sequence_count"] += part["sequence_count"]
+        merged["total_length"] += part["total_length"]
+        merged["min_length"] = min(merged["min_length"], part["min_length"])
+        merged["max_length"] = max(merged["max_length"], part["max_length"])
+        for atype, n in part["alphabet_types"].items():
+            merged["alphabet_types"][atype] = merged["alphabet_types"].get(atype, 0) + n
+    return merged
+
+
+def _range_stats(filepath, start, stop, block_size):
+    """Статистика записей, которые начинаются в диапазоне байтов [start, stop)."""
+    with open(filepath, "rb") as f:
+        start = _find_record_start(f, start, block_size)
+        if start >= stop:
+            return _collect_stats(())
+        f.seek(start)
+        return _collect_stats(_iter_seqs(f, block_size, start, stop))
+
+
+class _Windows:
+    """Нарезка потока остатков одной записи на окна для iter_windows."""
+
+    def __init__(self, size, step, partial):
+        self.size = size
+        self.step = step
+        self.partial = partial
+        self.header = None
+
+    def start(self, header):
+        # Записи с пустым заголовком пропускаются, как и при обычном чтении
+        self.header = header or None
+        self.buffer = bytearray()
+        # Позиция в записи первого байта буфера, начала следующего окна
+        # и конца последнего выданного окна
+        self.base = self.next_start = self.covered = 0
+
+    def feed(self, piece):
+        if self.header is None:
+            return
+        buffer = self.buffer
+        buffer += piece.translate(_UPPER, _WHITESPACE)
+        size = self.size
+        while self.next_start + size <= self.base + len(buffer):
+            yield self._window(self.next_start, self.next_start + size)
+            self.next_start += self.step
+        # Отбрасываем остатки, которые уже не войдут ни в одно окно
+        drop = min(self.next_start - self.base, len(buffer))
+        if drop > 0:
+            del buffer[:drop]
+            self.base += drop
+
+    def finish(self):
+        if self.header is None:
+            return
+        end = self.base + len(self.buffer)
+        if self.partial and self.covered < end and self.next_start < end:
+            yield self._window(self.next_start, end)
+        self.header = None
+
+    def _window(self, start, end):
+        self.covered = end
+        data = self.buffer[start - self.base:end - self.base]
+        return self.header, start, _seq_from_body(data, f"{self.header} [{start}:{end}]")
+
+
 class FastaReader:
-    """Читает FASTA-файл и возвращает Seq через итератор."""
+    """Читает FASTA-файл и возвращает Seq через итератор.
+
+    engine выбирает способ разбора: "block" (по умолчанию) читает файл
+    крупными двоичными блоками и ищет границы записей через bytes.find,
+    "lines" — построчное чтение в текстовом режиме.
+
+    Сжатие gzip и BGZF определяется по магическим байтам. Блоки BGZF
+    распаковываются в threads потоках, а поиск по индексу использует
+    .gzi и распаковывает только нужные блоки.
+
+    metrics — необязательный ReaderMetrics: итерация по файлу обновляет
+    его счётчики. Без него используется обычный путь без замеров.
 
-    def __init__(self, filepath):
+    cache — необязательный SequenceCache: get_sequence_by_id и fetch
+    сначала ищут результат в нём и сохраняют туда прочитанное.
+    """
+
+    ENGINES = ("block", "lines")
+
+    def __init__(self, filepath, engine="block", block_size=DEFAULT_BLOCK_SIZE, threads=None,
+                 metrics=None, cache=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Неизвестный движок разбора: {engine}")
         self.filepath = filepath
+        self.engine = engine
+        self.block_size = block_size
+        self.threads = threads
+        self.metrics = metrics
+        self.cache = cache
+        self.compression = detect_compression(filepath)
+        self.index = None
+        self.gzi = None
+        self.header_index = None
+        self._buffer = None
+        self._executor = None
+
+    def _open(self, seekable=False):
+        """Открывает файл в двоичном режиме, распаковывая gzip и BGZF."""
+        if self.compression == "bgzf":
+            raw = BgzfReader(self.filepath, self.threads, self._get_gzi() if seekable else None,
+                             self._get_executor())
+            return io.BufferedReader(raw, self.block_size)
+        if self.compression == "gzip":
+            return gzip.open(self.filepath, "rb")
+        return open(self.filepath, "rb")
+
+    def _get_executor(self):
+        """Пул потоков распаковки BGZF, общий для всех открытий файла."""
+        if self._executor is None and thread_count(self.threads) > 1:
+            self._executor = ThreadPoolExecutor(thread_count(self.threads))
+        return self._executor
+
+    def _get_gzi(self):
+        """Индекс .gzi для BGZF: свежий <файл>.gzi или построенный заново."""
+        if self.gzi is None:
+            path = self.filepath + ".gzi"
+            if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(self.filepath):
+                self.gzi = GziIndex.read(path)
+            else:
+                self.gzi = GziIndex.build(self.filepath)
+        return self.gzi
 
     def __iter__(self):
+        if self.metrics is not None:
+            return self._iter_measured(self.metrics)
+        if self.engine == "lines":
+            return self._iter_lines()
+        return self._iter_blocks()
+
+    def _iter_blocks(self):
+        with self._open() as f:
+            yield from _iter_seqs(f, self.block_size)
+
+    def _iter_measured(self, metrics):
+        """Итерация с замерами: время чтения, разбора и создания Seq.
+
+        Для движка "lines" считаются только записи и остатки.
+        """
+        clock = time.perf_counter
+        try:
+            if self.engine == "lines":
+                for seq in self._iter_lines():
+                    metrics.add_record(seq)
+                    yield seq
+                return
+            parser = _RecordParser()
+            with self._open() as f:
+                while not parser.done:
+                    start = clock()
+                    block = f.read(self.block_size)
+                    parsed = clock()
+                    metrics.io_time += parsed - start
+                    metrics.bytes_read += len(block)
+                    records = list(parser.feed(block) if block else parser.close())
+                    metrics.parse_time += clock() - parsed
+                    for _, header, body in records:
+                        if not header.strip():
+                            continue
+                        start = clock()
+                        seq = _make_seq(header, body)
+                        metrics.construct_time += clock() - start
+                        metrics.add_record(seq)
+                        yield seq
+        finally:
+            metrics.finish()
+
+    def _iter_lines(self):
         header = None
         seq_lines = []
-        with open(self.filepath, encoding="utf-8") as f:
+        with io.TextIOWrapper(self._open(), encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
                 if not line:
@@ -27,3 +536,362 @@ class FastaReader:
                     seq_lines.append(line)
             if header:
                 yield Seq("".join(seq_lines), header)
+
+    async def aiter(self, read_ahead=4):
+        """Асинхронный итератор Seq для asyncio: async for seq in reader.aiter().
+
+        Файл читается и разбирается в отдельном потоке, забегая вперёд
+        не больше чем на read_ahead блоков.
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(1)
+        f = await loop.run_in_executor(executor, self._open)
+        try:
+            async for seq in _aiter_seqs(
+                lambda: loop.run_in_executor(executor, f.read, self.block_size),
+                executor,
+                read_ahead,
+            ):
+                yield seq
+        finally:
+            # Закрытие встаёт в очередь того же потока после начатого чтения
+            executor.submit(f.close)
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    async def aiter_stream(stream, read_ahead=4, block_size=DEFAULT_BLOCK_SIZE):
+        """Асинхронный итератор Seq из asyncio.StreamReader (например, тела HTTP-запроса)."""
+        executor = ThreadPoolExecutor(1)
+        try:
+            async for seq in _aiter_seqs(lambda: stream.read(block_size), executor, read_ahead):
+                yield seq
+        finally:
+            executor.shutdown(wait=False)
+
+    def iter_windows(self, size, step=None, partial=True):
+        """Генератор окон (header, start, Seq) длины size с шагом step.
+
+        Файл читается потоком: в памяти держится не больше окна и одного
+        блока, а не вся запись. Заголовок Seq — "<header> [start:end]".
+        При partial=True в конце записи выдаётся укороченное окно, если
+        последние остатки не попали ни в одно полное окно.
+        """
+        step = step or size
+        if size < 1 or step < 1:
+            raise ValueError("Размер окна и шаг должны быть положительными")
+        with self._open() as f:
+            windows = _Windows(size, step, partial)
+            for header, piece in _iter_fragments(_read_blocks(f, self.block_size)):
+                if header is not None:
+                    yield from windows.finish()
+                    windows.start(header.decode("utf-8").rstrip())
+                else:
+                    yield from windows.feed(piece)
+            yield from windows.finish()
+
+    def get_file_stats(self, workers=None):
+        """Статистика файла: число записей, суммарная, минимальная и
+        максимальная длина, количество записей каждого типа алфавита.
+
+        При workers > 1 файл делится на диапазоны байтов, выровненные по
+        началам записей, и они обрабатываются в ProcessPoolExecutor.
+        Результат совпадает с последовательным проходом.
+        """
+        if not workers or workers < 2 or self.compression:
+            # Сжатый поток нельзя начать читать с произвольного байта
+            return _collect_stats(self)
+        size = os.path.getsize(self.filepath)
+        parts = workers * 4
+        bounds = [size * i // parts for i in range(parts + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _range_stats,
+                [self.filepath] * parts,
+                bounds[:-1],
+                bounds[1:],
+                [self.block_size] * parts,
+            )
+            return _merge_stats(results)
+
+    def scan_headers(self):
+        """Генератор (header, length, byte_offset) по всем записям.
+
+        Строки последовательностей не собираются: остатки считаются прямо
+        в прочитанных блоках, так что память не зависит от размера записей.
+        byte_offset — смещение символа ">" (для сжатых файлов — в
+        распакованном потоке).
+        """
+        with self._open() as f:
+            for offset, _, header, length in _scan_records(_read_blocks(f, self.block_size)):
+                yield header.decode("utf-8").rstrip(), length, offset
+
+    def get_sequence_count(self):
+        """Число записей в файле; последовательности не загружаются."""
+        return sum(1 for _ in self.scan_headers())
+
+    def iter_records(self):
+        """Генератор FastaRecord: заголовок, длина и границы записи в файле.
+
+        Последовательность записи читается только при обращении к ней.
+        Исключение — сжатые файлы: чтение диапазона в них заново
+        распаковывает поток (gzip — с начала, BGZF — с ближайшего блока),
+        поэтому сырое тело записи сохраняется в ней сразу при проходе.
+        Запись без последовательности, как и при обычной итерации,
+        вызывает ValueError.
+        """
+        from fasta_parser.record import FastaRecord
+
+        with self._open() as f:
+            for offset, end, header, length, body in self._scan_bodies(f):
+                if not length:
+                    raise ValueError("Последовательность не может быть пустой")
+                yield FastaRecord(self, header.decode("utf-8").rstrip(), length, offset, end, body)
+
+    def _scan_bodies(self, f):
+        """Генератор (offset, end, header, length, body) записей файла f.
+
+        Для несжатых файлов body — None: тело читается позже по границам.
+        """
+        if not self.compression:
+            for offset, end, header, length in _scan_records(_read_blocks(f, self.block_size)):
+                yield offset, end, header, length, None
+            return
+        parser = _RecordParser()
+        for block in itertools.chain(_read_blocks(f, self.block_size), (None,)):
+            for offset, header, body in parser.feed(block) if block else parser.close():
+                if header.strip():
+                    yield (offset, offset + len(header) + 2 + len(body), header,
+                           len(body.translate(None, _WHITESPACE)), body)
+
+    def filter_sequences(self, predicate):
+        """Генератор записей, для которых predicate(record) истинно.
+
+        Записи — ленивые FastaRecord: отброшенные фильтром по заголовку
+        или длине последовательности так и не загружаются.
+        """
+        for record in self.iter_records():
+            if predicate(record):
+                yield record
+
+    def get_sequences_by_type(self, alphabet_type):
+        """Генератор записей с типом алфавита alphabet_type (DNA, RNA, PROTEIN, UNKNOWN).
+
+        Тип определяется по байтам файла, строки последовательностей не собираются.
+        """
+        return self.filter_sequences(lambda record: record.alphabet_type() == alphabet_type)
+
+    def iter_batches(self, batch_size=10000):
+        """Генератор SeqBatch по batch_size записей (нужен numpy).
+
+        Записи упаковываются в буфер пакета напрямую из прочитанных блоков,
+        без создания промежуточных Seq.
+        """
+        from fasta_parser.batch import SeqBatch
+
+        headers = []
+        residues = []
+        with self._open() as f:
+            for header, body in _iter_records(f, self.block_size):
+                data = body.translate(_UPPER, _WHITESPACE)
+                if not data:
+                    raise ValueError("Последовательность не может быть пустой")
+                headers.append(header.decode("utf-8").rstrip())
+                residues.append(data)
+                if len(headers) >= batch_size:
+                    yield SeqBatch.from_residues(headers, residues)
+                    headers, residues = [], []
+        if headers:
+            yield SeqBatch.from_residues(headers, residues)
+
+    def build_index(self):
+        """Строит индекс .fai за один проход по файлу (для BGZF — и .gzi)."""
+        with self._open() as f:
+            self.index = FastaIndex.build(f)
+        if self.compression == "bgzf":
+            self.gzi = GziIndex.build(self.filepath)
+        return self.index
+
+    def save_index(self, path=None):
+        """Сохраняет индекс рядом с файлом (по умолчанию <файл>.fai).
+
+        Для BGZF рядом с .fai записывается и <файл>.gzi.
+        """
+        if self.index is None:
+            self.build_index()
+        self.index.write(path or self.filepath + ".fai")
+        if self.compression == "bgzf":
+            self._get_gzi().write(self.filepath + ".gzi")
+
+    def load_index(self, path=None):
+        """Загружает индекс из .fai файла."""
+        self.index = FastaIndex.read(path or self.filepath + ".fai")
+        return self.index
+
+    def _get_index(self):
+        """Возвращает индекс, подгружая свежий <файл>.fai, если он есть."""
+        if self.index is None:
+            path = self.filepath + ".fai"
+            if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(self.filepath):
+                self.load_index(path)
+        return self.index
+
+    def _cached(self, key, lookup, *args):
+        """Результат lookup(*args) через кэш по ключу файла и key."""
+        if self.cache is None:
+            return lookup(*args)
+        key = file_key(self.filepath) + key
+        seq = self.cache.get(key)
+        if seq is None:
+            seq = lookup(*args)
+            if seq is not None:
+                self.cache.put(key, seq)
+        return seq
+
+    def get_sequence_by_id(self, seq_id):
+        """Ищет запись по идентификатору или по части заголовка.
+
+        Если есть индекс и seq_id совпадает с именем записи, читается только
+        эта запись. Если рядом с файлом есть индекс заголовков (.hidx),
+        запись ищется по нему. Иначе файл просматривается целиком: точное
+        совпадение идентификатора важнее вхождения seq_id в заголовок.
+        """
+        return self._cached((seq_id,), self._find_sequence, seq_id)
+
+    def _find_sequence(self, seq_id):
+        index = self._get_index()
+        if index is not None and seq_id in index:
+            record = index[seq_id]
+            with self._open(seekable=True) as f:
+                header = read_header(f, record)
+                sequence = read_sequence(f, record)
+            return _seq_from_body(sequence, header)
+        header_index = self._get_header_index()
+        if header_index is not None:
+            offset = header_index.find(seq_id)
+            return None if offset is None else self._read_record_at(offset)
+        partial = None
+        for seq in self:
+            fields = seq.header.split()
+            if fields and fields[0] == seq_id:
+                return seq
+            if partial is None and seq_id in seq.header:
+                partial = seq
+        return partial
+
+    def build_header_index(self, path=None):
+        """Строит индекс заголовков и сохраняет его (по умолчанию <файл>.hidx)."""
+        self.header_index = HeaderIndex.build(self)
+        self.header_index.write(path or self.filepath + HeaderIndex.SUFFIX)
+        return self.header_index
+
+    def _get_header_index(self):
+        """Индекс заголовков, если рядом с файлом есть .hidx.
+
+        Если размер или mtime файла изменились, индекс перестраивается.
+        """
+        path = self.filepath + HeaderIndex.SUFFIX
+        if self.header_index is None:
+            if not os.path.exists(path):
+                return None
+            self.header_index = HeaderIndex.read(path)
+        if not self.header_index.is_fresh(self.filepath):
+            self.build_header_index(path)
+        return self.header_index
+
+    def _read_record_at(self, offset):
+        """Читает запись, заголовок которой начинается на смещении offset."""
+        with self._open(seekable=True) as f:
+            f.seek(offset)
+            return next(_iter_seqs(f, self.block_size, offset), None)
+
+    def find_sequences(self, query):
+        """Генератор записей, в заголовках которых есть все слова query.
+
+        Слова сравниваются без учёта регистра. Если индекса заголовков ещё
+        нет, он строится и сохраняется; читаются только найденные записи.
+        """
+        header_index = self._get_header_index() or self.build_header_index()
+        for offset in header_index.search(query):
+            yield self._read_record_at(offset)
+
+    def _mapped(self):
+        """Файл, отображённый в память (только для чтения)."""
+        if self.compression:
+            raise ValueError("Отображение в память доступно только для несжатых файлов")
+        if self._buffer is None:
+            with open(self.filepath, "rb") as f:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._buffer
+
+    def _read_range(self, start, end):
+        """Байты [start, end) файла (для сжатых — распакованного потока)."""
+        if not self.compression:
+            return self._mapped()[start:end]
+        with self._open(seekable=True) as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def close(self):
+        """Отпускает отображение файла и пул потоков распаковки BGZF.
+
+        Выданные MappedSeq остаются рабочими.
+        """
+        self._buffer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def iter_mapped(self):
+        """Генератор MappedSeq по всем записям индекса."""
+        index = self._get_index() or self.build_index()
+        buffer = self._mapped()
+        for record in index:
+            yield MappedSeq(buffer, record, header_at(buffer, record))
+
+    def get_mapped(self, seq_id):
+        """MappedSeq для записи seq_id; индекс строится при необходимости."""
+        index = self._get_index() or self.build_index()
+        if seq_id not in index:
+            return None
+        buffer = self._mapped()
+        record = index[seq_id]
+        return MappedSeq(buffer, record, header_at(buffer, record))
+
+    def fetch(self, seq_id, start, end):
+        """Фрагмент [start:end] записи seq_id как Seq или None, если записи нет.
+
+        Читаются только байты фрагмента по индексу .fai (он строится при
+        необходимости).
+        """
+        return self._cached((seq_id, start, end), self._fetch, seq_id, start, end)
+
+    def _fetch(self, seq_id, start, end):
+        index = self._get_index() or self.build_index()
+        if seq_id not in index:
+            return None
+        record = index[seq_id]
+        with self._open(seekable=True) as f:
+            header = read_header(f, record)
+            data = read_sequence(f, record, max(start, 0), end)
+        return _seq_from_body(data, f"{header} [{start}:{end}]")
+
+    def extract_subsequences(self, start, end):
+        """Генератор фрагментов [start:end] всех записей длиной не меньше end.
+
+        При наличии индекса записи несжатого файла не загружаются целиком:
+        из файла читаются только байты нужного фрагмента.
+        """
+        mapped = not self.compression and self._get_index() is not None
+        records = self.iter_mapped() if mapped else self
+        for seq in records:
+            if len(seq) >= end:
+                yield Seq(seq[start:end], f"{seq.header} [{start}:{end}]")
+
+    def write_filtered_fasta(self, output, predicate, line_width=60, bgzf=False, index=False):
+        """Записывает в output записи, для которых predicate(record) истинно.
+
+        Возвращает число записанных записей. Параметры записи — как у FastaWriter.
+        """
+        with FastaWriter(output, line_width, bgzf=bgzf, index=index,
+                         threads=self.threads) as writer:
+            return writer.write_all(self.filter_sequences(predicate))
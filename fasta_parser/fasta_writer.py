@@ -0,0 +1,90 @@
+"""
+Реализация класса FastaWriter
+"""
+
+from fasta_parser.bgzf import BgzfWriter
+from fasta_parser.faidx import FaiRecord, FastaIndex
+
+
+class FastaWriter:
+    """Потоковая запись последовательностей в FASTA.
+
+    Остатки переносятся по line_width символов в строке (0 — без переноса).
+    Записи копятся в памяти и сбрасываются в файл одним write по
+    buffer_size байтов. При bgzf=True файл сжимается в BGZF, при
+    index=True рядом пишется .fai (и .gzi для BGZF), посчитанный в том
+    же проходе.
+    """
+
+    def __init__(self, path, line_width=60, buffer_size=1 << 20, bgzf=False, index=False,
+                 threads=None):
+        if line_width < 0:
+            raise ValueError("Ширина строки не может быть отрицательной")
+        self.path = path
+        self.line_width = line_width
+        self.buffer_size = buffer_size
+        self.bgzf = bgzf
+        self.count = 0
+        self._file = BgzfWriter(path, threads) if bgzf else open(path, "wb")
+        self._parts = []
+        self._buffered = 0
+        self._offset = 0
+        self._records = [] if index else None
+
+    def write(self, seq):
+        """Дописывает одну запись Seq."""
+        head = f">{seq.header}\n".encode("utf-8")
+        residues = seq.sequence.encode("utf-8")
+        length = len(residues)
+        width = self.line_width or length
+        if length > width:
+            lines = [residues[i:i + width] for i in range(0, length, width)]
+            lines.append(b"")
+            body = b"\n".join(lines)
+        else:
+            body = residues + b"\n"
+        if self._records is not None:
+            fields = seq.header.split()
+            if fields:
+                bases = min(width, length)
+                self._records.append(
+                    FaiRecord(fields[0], length, self._offset + len(head), bases, bases + 1)
+                )
+        self._parts.append(head)
+        self._parts.append(body)
+        size = len(head) + len(body)
+        self._offset += size
+        self._buffered += size
+        self.count += 1
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write_all(self, seqs):
+        """Записывает все последовательности итерируемого seqs; возвращает их число."""
+        count = self.count
+        for seq in seqs:
+            self.write(seq)
+        return self.count - count
+
+    def flush(self):
+        """Сбрасывает накопленные записи в файл."""
+        if self._parts:
+            self._file.write(b"".join(self._parts))
+            self._parts = []
+            self._buffered = 0
+
+    def close(self):
+        """Дописывает буфер, закрывает файл и сохраняет индексы."""
+        self.flush()
+        self._file.close()
+        if self._records is not None:
+            FastaIndex(self._records).write(self.path + ".fai")
+            if self.bgzf:
+                self._file.index.write(self.path + ".gzi")
+            self._records = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
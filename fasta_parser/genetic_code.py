@@ -0,0 +1,84 @@
+"""
+Генетические коды, комплементарность и трансляция через таблицы bytes
+"""
+
+# Нуклеотиды IUPAC и их комплементы
+_IUPAC = b"ACGTURYSWKMBDHVN"
+_IUPAC_COMPLEMENT = b"TGCAAYRSWMKVHDBN"
+COMPLEMENT = bytes.maketrans(_IUPAC + _IUPAC.lower(), _IUPAC_COMPLEMENT + _IUPAC_COMPLEMENT.lower())
+
+DNA_LETTERS = frozenset("ACGTRYSWKMBDHVN")
+NUCLEOTIDE_LETTERS = DNA_LETTERS | {"U"}
+
+# Таблицы NCBI: аминокислоты и старты для кодонов в порядке TCAG
+# (первое основание меняется медленнее всего)
+CODON_TABLES = {
+    1: ("FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M------**--*----M---------------M----------------------------"),
+    2: ("FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+        "----------**--------------------MMMM----------**---M------------"),
+    4: ("FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--MM------**-------M------------MMMM---------------M------------"),
+    11: ("FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M------**--*----M------------MMMM---------------M------------"),
+}
+
+# Код неоднозначного основания: сумма с ним не меньше 64 и даёт X
+_INVALID = 64
+
+
+def _base_table(shift):
+    """Таблица байт -> код основания (T=0, C=1, A=2, G=3), сдвинутый на shift."""
+    codes = {}
+    for i, bases in enumerate(("TUtu", "Cc", "Aa", "Gg")):
+        codes.update(dict.fromkeys(bases.encode("ascii"), i))
+    return bytes(codes[i] << shift if i in codes else _INVALID for i in range(256))
+
+
+# Коды оснований на первой, второй и третьей позиции кодона
+_POSITION_TABLES = (_base_table(4), _base_table(2), _base_table(0))
+
+
+def codon_indices(data, start=0):
+    """Номера кодонов 0..63 для байтовой строки ACGT, начиная с позиции start.
+
+    Номер кодона собирается из трёх срезов с шагом 3: каждый срез
+    переводится в сдвинутые коды оснований, и они складываются как
+    большие целые. Поля не пересекаются, так что переносов между байтами
+    нет; кодоны с неоднозначными основаниями получают номер 64 и больше.
+    Неполный кодон в конце отбрасывается.
+    """
+    n = max(0, len(data) - start) // 3
+    value = 0
+    for i, table in enumerate(_POSITION_TABLES):
+        value += int.from_bytes(data[start + i:start + 3 * n:3].translate(table), "big")
+    return value.to_bytes(n, "big")
+
+
+def translation_table(code=1):
+    """Таблица номер кодона -> аминокислота для bytes.translate."""
+    if code not in CODON_TABLES:
+        raise ValueError(f"Неизвестный генетический код: {code}")
+    amino_acids = CODON_TABLES[code][0].encode("ascii")
+    return amino_acids + b"X" * (256 - len(amino_acids))
+
+
+def reverse_complement(data):
+    """Обратная комплементарная цепь байтовой строки IUPAC."""
+    return data.translate(COMPLEMENT)[::-1]
+
+
+def translate(data, code=1):
+    """Транслирует байтовую строку ACGT/ACGU в рамке 1; неполный кодон отбрасывается."""
+    return codon_indices(data).translate(translation_table(code))
+
+
+def translate_six_frames(data, code=1):
+    """Трансляция во всех шести рамках: {1, 2, 3, -1, -2, -3} -> bytes."""
+    table = translation_table(code)
+    reverse = reverse_complement(data)
+    frames = {}
+    for offset in range(3):
+        frames[offset + 1] = codon_indices(data, offset).translate(table)
+        frames[-offset - 1] = codon_indices(reverse, offset).translate(table)
+    return frames
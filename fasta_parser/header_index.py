@@ -0,0 +1,113 @@
+"""
+Индекс заголовков FASTA-файла: идентификаторы и слова заголовков
+"""
+
+import os
+import re
+
+from fasta_parser.exceptions import FastaFormatError
+
+# Слова заголовка, по которым строится индекс
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokens(text):
+    """Слова текста в нижнем регистре."""
+    return _TOKEN.findall(text.lower())
+
+
+class HeaderIndex:
+    """Индекс заголовков: идентификатор и слова заголовка -> смещение записи.
+
+    Хранится рядом с файлом в <файл>.hidx вместе с размером и mtime
+    файла, по которым устаревший индекс распознаётся и перестраивается.
+    """
+
+    SUFFIX = ".hidx"
+
+    def __init__(self, entries, size=None, mtime_ns=None):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.offsets = []
+        self.headers = []
+        self.ids = {}
+        self.tokens = {}
+        for i, (offset, header) in enumerate(entries):
+            self.offsets.append(offset)
+            self.headers.append(header)
+            fields = header.split()
+            if fields:
+                # Как и в .fai, при повторе идентификатора оставляем первую запись
+                self.ids.setdefault(fields[0], i)
+            for token in set(_tokens(header)):
+                self.tokens.setdefault(token, []).append(i)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @classmethod
+    def build(cls, reader):
+        """Строит индекс по FastaReader за один просмотр заголовков."""
+        stat = os.stat(reader.filepath)
+        entries = [(offset, header) for header, _, offset in reader.scan_headers()]
+        return cls(entries, stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def read(cls, path):
+        """Загружает индекс из файла .hidx."""
+        with open(path, encoding="utf-8") as f:
+            fields = f.readline().rstrip("\n").split("\t")
+            if len(fields) != 2:
+                raise FastaFormatError("Некорректный заголовок .hidx", 1)
+            size, mtime_ns = map(int, fields)
+            entries = []
+            for line_no, line in enumerate(f, 2):
+                offset, sep, header = line.rstrip("\n").partition("\t")
+                if not sep:
+                    raise FastaFormatError("Некорректная строка .hidx", line_no)
+                entries.append((int(offset), header))
+        return cls(entries, size, mtime_ns)
+
+    def write(self, path):
+        """Сохраняет индекс: строка с размером и mtime, затем смещение и заголовок."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{self.size}\t{self.mtime_ns}\n")
+            for offset, header in zip(self.offsets, self.headers):
+                f.write(f"{offset}\t{header}\n")
+
+    def is_fresh(self, filepath):
+        """Совпадают ли размер и mtime файла с записанными в индексе."""
+        stat = os.stat(filepath)
+        return (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime_ns)
+
+    def find(self, query):
+        """Смещение записи по идентификатору или вхождению query в заголовок.
+
+        Идентификатор ищется за O(1). Если query — целое слово заголовка,
+        проверяются только записи с этим словом (такое совпадение важнее
+        вхождения внутрь слова); иначе просматриваются заголовки в памяти,
+        без чтения файла.
+        """
+        i = self.ids.get(query)
+        if i is not None:
+            return self.offsets[i]
+        words = _tokens(query)
+        candidates = self.tokens.get(words[0], ()) if len(words) == 1 else ()
+        for i in candidates:
+            if query in self.headers[i]:
+                return self.offsets[i]
+        for i, header in enumerate(self.headers):
+            if query in header:
+                return self.offsets[i]
+        return None
+
+    def search(self, query):
+        """Смещения записей, в заголовках которых есть все слова query (без учёта регистра)."""
+        words = set(_tokens(query))
+        if not words:
+            return []
+        postings = sorted((self.tokens.get(word, ()) for word in words), key=len)
+        hits = set(postings[0])
+        for posting in postings[1:]:
+            hits.intersection_update(posting)
+        return [self.offsets[i] for i in sorted(hits)]
@@ -0,0 +1,227 @@
+"""
+Подсчёт k-меров по FASTA-файлу (нужен numpy)
+"""
+
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy — необязательная зависимость
+    np = None
+
+from fasta_parser.fasta_reader import _UPPER, _WHITESPACE, _iter_records
+
+# Наибольшее k, при котором k-мер по 2 бита помещается в uint64
+MAX_K = 31
+
+# Число частей, на которые делятся таблицы при сбросе на диск; часть
+# определяется первыми двумя основаниями, так что части идут по порядку
+_PARTITIONS = 16
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Для подсчёта k-меров нужен numpy: pip install numpy")
+
+
+def _code_table():
+    """Таблица байт -> код основания A=0, C=1, G=2, T=3; прочие — 4."""
+    table = np.full(256, 4, dtype=np.uint8)
+    for code, base in enumerate(b"ACGT"):
+        table[base] = code
+    return table
+
+
+def kmer_values(data, k, canonical=True):
+    """Коды k-меров байтовой строки ACGT как uint64 по 2 бита на основание.
+
+    Окна с N и прочими символами вне ACGT пропускаются. При canonical
+    берётся меньший из кодов k-мера и его обратного комплемента.
+    """
+    codes = _CODE_TABLE[np.frombuffer(data, dtype=np.uint8)]
+    n = len(codes) - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.uint64)
+    # Окно годно, если в нём нет ни одного кода 4
+    invalid = np.concatenate(([0], np.cumsum(codes == 4)))
+    valid = invalid[k:] == invalid[:n]
+    bases = (codes & 3).astype(np.uint64)
+    values = np.zeros(n, dtype=np.uint64)
+    two = np.uint64(2)
+    for j in range(k):
+        values <<= two
+        values |= bases[j:j + n]
+    if canonical:
+        reverse = np.zeros(n, dtype=np.uint64)
+        complement = bases ^ np.uint64(3)
+        for j in range(k):
+            reverse |= complement[j:j + n] << np.uint64(2 * j)
+        np.minimum(values, reverse, out=values)
+    return values[valid]
+
+
+def _merge(tables):
+    """Сливает таблицы (keys, counts) в одну с уникальными отсортированными ключами."""
+    tables = [table for table in tables if len(table[0])]
+    if not tables:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64)
+    if len(tables) == 1:
+        return tables[0]
+    keys = np.concatenate([keys for keys, _ in tables])
+    counts = np.concatenate([counts for _, counts in tables])
+    order = np.argsort(keys, kind="stable")
+    keys, counts = keys[order], counts[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[starts], np.add.reduceat(counts, starts)
+
+
+def _count_chunks(chunks, k, canonical):
+    """Таблица (keys, counts) для списка кусков последовательностей."""
+    values = np.concatenate([kmer_values(chunk, k, canonical) for chunk in chunks])
+    keys, counts = np.unique(values, return_counts=True)
+    return keys, counts.astype(np.uint64)
+
+
+def _iter_chunks(reader, k, chunk_size, batch_size):
+    """Пакеты кусков записей суммарно около batch_size остатков.
+
+    Длинные записи режутся на куски chunk_size с перекрытием k - 1,
+    чтобы ни один k-мер не потерялся и не посчитался дважды.
+    """
+    batch = []
+    size = 0
+    with reader._open() as f:
+        for _, body in _iter_records(f, reader.block_size):
+            data = body.translate(_UPPER, _WHITESPACE)
+            for start in range(0, max(len(data) - k + 1, 1), chunk_size):
+                chunk = data[start:start + chunk_size + k - 1]
+                batch.append(chunk)
+                size += len(chunk)
+                if size >= batch_size:
+                    yield batch
+                    batch, size = [], 0
+    if batch:
+        yield batch
+
+
+class _Spill:
+    """Отсортированные прогоны таблиц на диске, разбитые на части по префиксу."""
+
+    def __init__(self, k, spill_dir):
+        self.directory = tempfile.mkdtemp(prefix="kmers-", dir=spill_dir)
+        self.shift = np.uint64(max(2 * k - 4, 0))
+        self.runs = 0
+
+    def write(self, keys, counts):
+        parts = (keys >> self.shift).astype(np.intp)
+        bounds = np.searchsorted(parts, np.arange(_PARTITIONS + 1))
+        for part in range(_PARTITIONS):
+            lo, hi = bounds[part], bounds[part + 1]
+            if hi > lo:
+                np.save(self._path(self.runs, part, "keys"), keys[lo:hi])
+                np.save(self._path(self.runs, part, "counts"), counts[lo:hi])
+        self.runs += 1
+
+    def _path(self, run, part, kind):
+        return os.path.join(self.directory, f"{run}-{part}.{kind}.npy")
+
+    def iter_parts(self):
+        """Слитые таблицы частей по порядку ключей."""
+        for part in range(_PARTITIONS):
+            tables = []
+            for run in range(self.runs):
+                path = self._path(run, part, "keys")
+                if os.path.exists(path):
+                    tables.append((np.load(path), np.load(self._path(run, part, "counts"))))
+            yield _merge(tables)
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _iter_tables(reader, k, canonical, workers, chunk_size):
+    """Таблицы пакетов в порядке готовности; при workers > 1 — из пула процессов."""
+    batches = _iter_chunks(reader, k, chunk_size, chunk_size)
+    if not workers or workers < 2:
+        for batch in batches:
+            yield _count_chunks(batch, k, canonical)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(_count_chunks, batch, k, canonical))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def decode_kmers(keys, k):
+    """Строки k-меров по массиву кодов."""
+    shifts = np.arange(2 * (k - 1), -1, -2, dtype=np.uint64)
+    letters = np.frombuffer(b"ACGT", dtype=np.uint8)[(keys[:, None] >> shifts) & np.uint64(3)]
+    data = letters.tobytes().decode("ascii")
+    return [data[i:i + k] for i in range(0, len(data), k)]
+
+
+def iter_kmer_arrays(reader, k, canonical=True, workers=None, memory_limit=1 << 30,
+                     spill_dir=None, chunk_size=1 << 22):
+    """Генератор таблиц (keys, counts) по возрастанию кодов k-меров.
+
+    Пакеты записей считаются в workers процессах (np.unique по кодам),
+    а их таблицы сливаются в общую. Если общая таблица превышает
+    memory_limit байтов, она сбрасывается на диск частями по префиксу;
+    в конце части сливаются по одной. Подсчёт точный.
+    """
+    _require_numpy()
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k должно быть от 1 до {MAX_K}")
+    keys, counts = _merge(())
+    pending = []
+    pending_bytes = 0
+    spill = None
+    try:
+        for table in _iter_tables(reader, k, canonical, workers, chunk_size):
+            pending.append(table)
+            pending_bytes += table[0].nbytes + table[1].nbytes
+            if pending_bytes < memory_limit // 4:
+                continue
+            keys, counts = _merge([(keys, counts)] + pending)
+            pending, pending_bytes = [], 0
+            if keys.nbytes + counts.nbytes > memory_limit:
+                if spill is None:
+                    spill = _Spill(k, spill_dir)
+                spill.write(keys, counts)
+                keys, counts = _merge(())
+        keys, counts = _merge([(keys, counts)] + pending)
+        if spill is None:
+            if len(keys):
+                yield keys, counts
+            return
+        spill.write(keys, counts)
+        del keys, counts
+        for part in spill.iter_parts():
+            if len(part[0]):
+                yield part
+    finally:
+        if spill is not None:
+            spill.close()
+
+
+def iter_kmer_counts(reader, k, canonical=True, **kwargs):
+    """Генератор пар (k-мер, количество) в алфавитном порядке k-меров."""
+    for keys, counts in iter_kmer_arrays(reader, k, canonical, **kwargs):
+        yield from zip(decode_kmers(keys, k), counts.tolist())
+
+
+def kmer_counts(reader, k, canonical=True, **kwargs):
+    """Словарь k-мер -> количество; параметры — как у iter_kmer_arrays."""
+    return dict(iter_kmer_counts(reader, k, canonical, **kwargs))
+
+
+if np is not None:
+    _CODE_TABLE = _code_table()
@@ -0,0 +1,73 @@
+"""
+Реализация класса MappedSeq
+"""
+
+from fasta_parser.seq import Seq, _count_bytes
+
+# Сколько байтов файла обрабатывается за раз при подсчёте состава
+_CHUNK_SIZE = 1 << 22
+
+
+class MappedSeq(Seq):
+    """Последовательность, которая читается из mmap файла по записи индекса.
+
+    Остатки не хранятся в памяти: срез seq[a:b] переводит координаты
+    в байты файла с учётом переводов строк и копирует только их.
+    """
+
+    __slots__ = ("_buffer", "record")
+
+    def __init__(self, buffer, record, header):
+        self._buffer = buffer
+        self.record = record
+        self.header = header
+        self._counts = None
+
+    @property
+    def sequence(self):
+        """Вся последовательность; для хромосом лучше брать срезы."""
+        return self.fetch(0, self.record.length)
+
+    def __len__(self):
+        return self.record.length
+
+    def __getitem__(self, key):
+        length = self.record.length
+        if isinstance(key, slice):
+            positions = range(*key.indices(length))
+            if not positions:
+                return ""
+            if positions.step == 1:
+                return self.fetch(positions.start, positions.stop)
+            lo, hi = min(positions[0], positions[-1]), max(positions[0], positions[-1])
+            data = self.fetch(lo, hi + 1)
+            return data[positions[0] - lo::positions.step][:len(positions)]
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError("Индекс вне последовательности")
+        return self.fetch(key, key + 1)
+
+    def fetch(self, start, end):
+        """Возвращает остатки [start, end), читая только нужные байты."""
+        start = max(0, start)
+        end = min(end, self.record.length)
+        first, last = self.record.byte_range(start, end)
+        data = self._buffer[first:last].translate(None, b"\r\n")
+        return data.decode("utf-8").upper()
+
+    def _histogram(self):
+        """Гистограмма символов, посчитанная кусками прямо по отображению."""
+        if self._counts is None:
+            counts = {}
+            first, last = self.record.byte_range(0, self.record.length)
+            for pos in range(first, last, _CHUNK_SIZE):
+                chunk = self._buffer[pos:min(pos + _CHUNK_SIZE, last)]
+                for char, n in _count_bytes(chunk.translate(None, b"\r\n").upper()).items():
+                    counts[char] = counts.get(char, 0) + n
+            self._counts = counts
+        return self._counts
+
+    def to_seq(self):
+        """Загружает запись в память как обычный Seq."""
+        return Seq(self.sequence, self.header)
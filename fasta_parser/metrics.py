@@ -0,0 +1,56 @@
+"""
+Счётчики чтения FastaReader для мониторинга
+"""
+
+
+class ReaderMetrics:
+    """Счётчики FastaReader: объём, записи и время по этапам.
+
+    Передаётся в FastaReader(metrics=...) и накапливается от прохода к
+    проходу. Время делится на чтение файла (io_time), поиск границ
+    записей (parse_time) и создание Seq (construct_time). callback, если
+    задан, вызывается с самим объектом в конце каждого прохода — например,
+    чтобы выгрузить as_dict() в систему мониторинга.
+    """
+
+    FIELDS = (
+        "bytes_read", "records", "residues", "io_time", "parse_time", "construct_time",
+        "max_record_length", "max_record_header",
+    )
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        """Обнуляет счётчики."""
+        self.bytes_read = 0
+        self.records = 0
+        self.residues = 0
+        self.io_time = 0.0
+        self.parse_time = 0.0
+        self.construct_time = 0.0
+        self.max_record_length = 0
+        self.max_record_header = None
+
+    def add_record(self, seq):
+        """Учитывает выданную запись."""
+        length = len(seq)
+        self.records += 1
+        self.residues += length
+        if length > self.max_record_length:
+            self.max_record_length = length
+            self.max_record_header = seq.header
+
+    def finish(self):
+        """Конец прохода по файлу: вызывает callback."""
+        if self.callback is not None:
+            self.callback(self)
+
+    def as_dict(self):
+        """Снимок счётчиков в виде словаря."""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"ReaderMetrics({fields})"
@@ -0,0 +1,158 @@
+"""
+Реализация класса MultiFastaReader
+"""
+
+import queue
+import threading
+from collections import deque
+
+from fasta_parser.fasta_reader import FastaReader
+
+# Метка конца файла в очереди
+_DONE = object()
+
+# Как часто (в секундах) поток, ждущий места в очереди, проверяет остановку
+_POLL = 0.1
+
+
+def _put(out, item, stop):
+    """Кладёт item в ограниченную очередь; False, если чтение остановлено."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=_POLL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(path, put, reader_kwargs, batch_size):
+    """Читает файл path и отдаёт через put пакеты Seq, затем _DONE.
+
+    Пакет закрывается, когда в нём набирается batch_size остатков, так
+    что длинные записи идут по одной, а короткие — большими пачками.
+    Ошибка чтения передаётся через put вместо пакета.
+    """
+    try:
+        batch = []
+        size = 0
+        for seq in FastaReader(path, **reader_kwargs):
+            batch.append(seq)
+            size += len(seq)
+            if size >= batch_size:
+                if not put(batch):
+                    return
+                batch = []
+                size = 0
+        if batch and not put(batch):
+            return
+        put(_DONE)
+    except Exception as exc:
+        put(exc)
+
+
+class MultiFastaReader:
+    """Параллельное чтение многих FASTA-файлов с упреждением.
+
+    Файлы открываются и разбираются в workers потоках; итерация выдаёт
+    пары (path, Seq). При ordered=True файлы идут в порядке paths, а
+    записи файла — подряд; при ordered=False пакеты записей выдаются по
+    мере готовности. Каждый поток держит не больше prefetch готовых
+    пакетов примерно по batch_size остатков и ждёт, пока их заберут,
+    поэтому память ограничена независимо от числа файлов. Остальные
+    параметры передаются в FastaReader.
+    """
+
+    def __init__(self, paths, workers=4, ordered=True, prefetch=4, batch_size=1 << 20,
+                 **reader_kwargs):
+        if workers < 1:
+            raise ValueError("Число потоков должно быть положительным")
+        if prefetch < 1:
+            raise ValueError("Размер упреждения должен быть положительным")
+        self.paths = list(paths)
+        self.workers = workers
+        self.ordered = ordered
+        self.prefetch = prefetch
+        self.batch_size = batch_size
+        self.reader_kwargs = reader_kwargs
+
+    def __iter__(self):
+        if self.ordered:
+            return self._iter_ordered()
+        return self._iter_completed()
+
+    def _start(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        return thread
+
+    def _iter_ordered(self):
+        """Файлы по порядку; вперёд читаются не больше workers файлов."""
+        stop = threading.Event()
+        paths = iter(self.paths)
+        active = deque()
+
+        def start_next():
+            path = next(paths, None)
+            if path is None:
+                return
+            out = queue.Queue(self.prefetch)
+            thread = self._start(
+                _produce, path, lambda item: _put(out, item, stop),
+                self.reader_kwargs, self.batch_size,
+            )
+            active.append((path, out, thread))
+
+        try:
+            for _ in range(self.workers):
+                start_next()
+            while active:
+                path, out, _ = active[0]
+                item = out.get()
+                if item is _DONE:
+                    active.popleft()
+                    start_next()
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                for seq in item:
+                    yield path, seq
+        finally:
+            stop.set()
+            for _, _, thread in active:
+                thread.join()
+
+    def _iter_completed(self):
+        """Пакеты в порядке готовности из общей очереди."""
+        stop = threading.Event()
+        out = queue.Queue(self.prefetch * self.workers)
+        paths = iter(self.paths)
+        lock = threading.Lock()
+
+        def work():
+            while not stop.is_set():
+                with lock:
+                    path = next(paths, None)
+                if path is None:
+                    break
+                _produce(path, lambda item, path=path: _put(out, (path, item), stop),
+                         self.reader_kwargs, self.batch_size)
+            _put(out, (None, _DONE), stop)
+
+        threads = [self._start(work) for _ in range(min(self.workers, len(self.paths)))]
+        running = len(threads)
+        try:
+            while running:
+                path, item = out.get()
+                if item is _DONE:
+                    if path is None:
+                        running -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                for seq in item:
+                    yield path, seq
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,95 @@
+"""
+Поиск открытых рамок считывания во всех шести рамках
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from fasta_parser.genetic_code import CODON_TABLES, codon_indices, reverse_complement
+
+# Кодон ATG в нумерации codon_indices (T=0, C=1, A=2, G=3)
+_ATG = 2 * 16 + 0 * 4 + 3
+
+# ORF — старт и все кодоны до ближайшего стопа включительно
+_ORF = re.compile(rb"M[^*]*\*")
+
+_CLASS_TABLES = {}
+
+
+def _class_table(code, alternative_starts):
+    """Таблица номер кодона -> класс: M — старт, * — стоп, - — прочие."""
+    key = (code, alternative_starts)
+    if key not in _CLASS_TABLES:
+        if code not in CODON_TABLES:
+            raise ValueError(f"Неизвестный генетический код: {code}")
+        amino_acids, starts = CODON_TABLES[code]
+        table = bytearray(b"-" * 256)
+        for i, (aa, start) in enumerate(zip(amino_acids, starts)):
+            if aa == "*":
+                table[i] = ord("*")
+            elif start == "M" and (alternative_starts or i == _ATG):
+                table[i] = ord("M")
+        _CLASS_TABLES[key] = bytes(table)
+    return _CLASS_TABLES[key]
+
+
+def _frame_orfs(strand, offset, table, min_length):
+    """ORF одной рамки: пары (start, end) в координатах strand."""
+    classes = codon_indices(strand, offset).translate(table)
+    # После последнего стопа ORF нет; обрезаем хвост, чтобы поиск
+    # не просматривал его заново от каждого старта
+    classes = classes[:classes.rfind(b"*") + 1]
+    for match in _ORF.finditer(classes):
+        start, end = offset + 3 * match.start(), offset + 3 * match.end()
+        if end - start >= min_length:
+            yield start, end
+
+
+def iter_orfs(data, min_length=75, code=1, alternative_starts=False):
+    """Генератор ORF байтовой строки ДНК: (start, end, frame, seq).
+
+    Каждая рамка просматривается один раз: кодоны переводятся в классы
+    старт/стоп/прочие одним bytes.translate, и ORF (от первого старта
+    после стопа до следующего стопа включительно) ищутся regex finditer.
+    start и end — координаты прямой цепи, frame — 1..3 или -1..-3, seq —
+    ORF на своей цепи. По умолчанию стартом считается только ATG.
+    """
+    table = _class_table(code, alternative_starts)
+    length = len(data)
+    for offset in range(3):
+        for start, end in _frame_orfs(data, offset, table, min_length):
+            yield start, end, offset + 1, data[start:end]
+    reverse = reverse_complement(data)
+    for offset in range(3):
+        for start, end in _frame_orfs(reverse, offset, table, min_length):
+            yield length - end, length - start, -offset - 1, reverse[start:end]
+
+
+def _record_orfs(header, data, min_length, code, alternative_starts):
+    return header, [
+        (start, end, frame, seq.decode("ascii"))
+        for start, end, frame, seq in iter_orfs(data, min_length, code, alternative_starts)
+    ]
+
+
+def find_orfs_parallel(seqs, min_length=75, code=1, alternative_starts=False, workers=None):
+    """Генератор (header, orfs) по последовательностям seqs в пуле процессов.
+
+    seqs — любой итерируемый источник Seq, например FastaReader. Записи
+    отдаются пулу по мере чтения, не больше двух на процесс, так что файл
+    не загружается целиком; результаты идут в порядке записей.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for seq in seqs:
+            pending.append(executor.submit(
+                _record_orfs, seq.header, seq.sequence.encode("ascii"),
+                min_length, code, alternative_starts,
+            ))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
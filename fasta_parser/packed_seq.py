@@ -0,0 +1,117 @@
+"""
+Реализация класса PackedSeq
+"""
+
+import re
+
+from fasta_parser.seq import Seq, _normalize
+
+# Коды нуклеотидов: A=0, C=1, G=2, T (в RNA — U)=3; всё остальное, включая
+# U в DNA и T в RNA, кодируется как 0 и восстанавливается из списка исключений
+_DNA_ENCODE = bytes({ord("C"): 1, ord("G"): 2, ord("T"): 3}.get(i, 0) for i in range(256))
+_RNA_ENCODE = bytes({ord("C"): 1, ord("G"): 2, ord("U"): 3}.get(i, 0) for i in range(256))
+
+# Таблицы сдвига кода на место в байте: первое основание в старших битах
+_SHIFTS = [bytes((i << shift) & 0xFF for i in range(256)) for shift in (6, 4, 2, 0)]
+
+# Таблицы распаковки: байт -> буква основания на позиции 0..3
+_DNA_LETTERS = [bytes(b"ACGT"[(i >> shift) & 3] for i in range(256)) for shift in (6, 4, 2, 0)]
+_RNA_LETTERS = [bytes(b"ACGU"[(i >> shift) & 3] for i in range(256)) for shift in (6, 4, 2, 0)]
+
+# Таблицы кода основания на позиции 0..3 упакованного байта
+_CODES = [bytes((i >> shift) & 3 for i in range(256)) for shift in (6, 4, 2, 0)]
+
+# Серии одинаковых символов, не входящих в четырёхбуквенный алфавит
+_DNA_EXCEPTIONS = re.compile(r"([^ACGT])\1*")
+_RNA_EXCEPTIONS = re.compile(r"([^ACGU])\1*")
+
+
+def _pack(sequence, rna=False):
+    """Упаковывает строку ACGT (при rna — ACGU) по 2 бита на основание."""
+    codes = sequence.encode("ascii").translate(_RNA_ENCODE if rna else _DNA_ENCODE)
+    codes += b"\x00" * (-len(codes) % 4)
+    # Поля разных оснований в байте не пересекаются, поэтому сумма больших
+    # целых равна побитовому ИЛИ и считается целиком на C
+    value = 0
+    for i, table in enumerate(_SHIFTS):
+        value += int.from_bytes(codes[i::4].translate(table), "big")
+    return value.to_bytes(len(codes) // 4, "big")
+
+
+class PackedSeq(Seq):
+    """Нуклеотидная последовательность, упакованная по 2 бита на основание.
+
+    N и прочие коды IUPAC хранятся отдельным списком серий
+    (start, end, символ). Подходит для DNA и RNA; белки тоже
+    сохранятся без потерь, но без выигрыша в памяти.
+    """
+
+    __slots__ = ("_packed", "_length", "_rna", "_exceptions")
+
+    def __init__(self, seq, header=""):
+        sequence = _normalize(seq)
+        if not sequence.isascii():
+            raise ValueError("Упаковать можно только последовательность из ASCII-символов")
+        self._rna = "U" in sequence and "T" not in sequence
+        pattern = _RNA_EXCEPTIONS if self._rna else _DNA_EXCEPTIONS
+        self._exceptions = tuple(
+            (m.start(), m.end(), m.group(1)) for m in pattern.finditer(sequence)
+        ) or None
+        self._packed = _pack(sequence, self._rna)
+        self._length = len(sequence)
+        self.header = header
+        self._counts = None
+
+    @property
+    def sequence(self):
+        return self._unpack(0, self._length)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                lo, hi = (start, stop) if step > 0 else (stop + 1, start + 1)
+                return self._unpack(lo, hi)[start - lo::step] if hi > lo else ""
+            return self._unpack(start, stop) if stop > start else ""
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("Индекс вне последовательности")
+        return self._unpack(key, key + 1)
+
+    def _unpack(self, start, end):
+        """Распаковывает основания [start, end)."""
+        first = start // 4
+        packed = self._packed[first:(end + 3) // 4]
+        letters = bytearray(len(packed) * 4)
+        for i, table in enumerate(_RNA_LETTERS if self._rna else _DNA_LETTERS):
+            letters[i::4] = packed.translate(table)
+        shift = first * 4
+        for run_start, run_end, char in self._exceptions or ():
+            lo, hi = max(run_start, start), min(run_end, end)
+            if lo < hi:
+                letters[lo - shift:hi - shift] = char.encode("ascii") * (hi - lo)
+        return letters[start - shift:end - shift].decode("ascii")
+
+    def _histogram(self):
+        """Гистограмма символов, посчитанная по упакованным байтам."""
+        if self._counts is None:
+            codes = [0, 0, 0, 0]
+            for table in _CODES:
+                unpacked = self._packed.translate(table)
+                for code in range(4):
+                    codes[code] += unpacked.count(code)
+            # Добивка до целого байта и позиции исключений закодированы как A
+            codes[0] -= len(self._packed) * 4 - self._length
+            counts = {}
+            for start, end, char in self._exceptions or ():
+                codes[0] -= end - start
+                counts[char] = counts.get(char, 0) + end - start
+            for letter, n in zip("ACGU" if self._rna else "ACGT", codes):
+                if n:
+                    counts[letter] = n
+            self._counts = counts
+        return self._counts
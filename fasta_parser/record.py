@@ -0,0 +1,66 @@
+"""
+Реализация класса FastaRecord
+"""
+
+from fasta_parser.fasta_reader import _UPPER, _WHITESPACE, _seq_from_body
+from fasta_parser.seq import Seq, _count_bytes, _count_residues
+
+
+class FastaRecord(Seq):
+    """Лёгкая ссылка на запись файла: заголовок, длина и границы в файле.
+
+    Последовательность читается из файла только при первом обращении к
+    sequence (или к методу, которому она нужна) и затем хранится. len()
+    известна сразу, а состав считается по байтам файла без сборки строки,
+    так что фильтры по заголовку, длине или типу алфавита почти ничего
+    не копируют.
+    """
+
+    __slots__ = ("_reader", "length", "offset", "end", "_sequence", "_data")
+
+    def __init__(self, reader, header, length, offset, end, data=None):
+        self._reader = reader
+        # Сырое тело записи, если оно уже прочитано (для gzip и BGZF)
+        self._data = data
+        self.header = header
+        self.length = length
+        self.offset = offset
+        self.end = end
+        self._sequence = None
+        self._counts = None
+
+    @property
+    def sequence(self):
+        if self._sequence is None:
+            self._sequence = _seq_from_body(self._body(), self.header).sequence
+        return self._sequence
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"FastaRecord({self.header!r}, length={self.length}, offset={self.offset})"
+
+    def _body(self):
+        """Сырые байты тела записи из файла."""
+        if self._data is not None:
+            return self._data
+        data = self._reader._read_range(self.offset, self.end)
+        nl = data.find(b"\n")
+        return data[nl + 1:] if nl != -1 else b""
+
+    def _histogram(self):
+        """Гистограмма символов; без загруженной строки — по байтам файла."""
+        if self._counts is None:
+            if self._sequence is not None:
+                return super()._histogram()
+            data = self._body().translate(_UPPER, _WHITESPACE)
+            if data.isascii():
+                self._counts = _count_bytes(data)
+            else:
+                self._counts = _count_residues(self.sequence)
+        return self._counts
+
+    def to_seq(self):
+        """Загружает запись в память как обычный Seq."""
+        return Seq._from_normalized(self.sequence, self.header)
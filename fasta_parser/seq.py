@@ -2,15 +2,79 @@
 Реализация класса Seq
 """
 
+from collections import Counter
+
+from fasta_parser import genetic_code, orfs
+from fasta_parser.exceptions import InvalidSequenceError
+
+_DNA = frozenset("ATCG")
+_RNA = frozenset("AUCG")
+_PROTEIN = frozenset("ACDEFGHIKLMNPQRSTVWY")
+
+def _count_bytes(data):
+    """Гистограмма символов ASCII-последовательности.
+
+    Каждый символ удаляется из остатка через bytes.translate, а его
+    количество — разница длин. Это быстрее bytes.count, и остаток
+    с каждым шагом короче.
+    """
+    counts = {}
+    while data:
+        code = data[0]
+        rest = data.translate(None, bytes((code,)))
+        counts[chr(code)] = len(data) - len(rest)
+        data = rest
+    return counts
+
+
+def _count_residues(sequence):
+    """Гистограмма символов строки."""
+    if sequence.isascii():
+        return _count_bytes(sequence.encode("ascii"))
+    return dict(Counter(sequence))
+
+
+def _classify(letters):
+    """Тип алфавита по множеству встречающихся символов."""
+    if letters <= _DNA:
+        return "DNA"
+    if letters <= _RNA:
+        return "RNA"
+    if letters <= _PROTEIN:
+        return "PROTEIN"
+    return "UNKNOWN"
+
+
+def _normalize(seq):
+    """Проверяет, что последовательность не пуста, и приводит её к верхнему регистру."""
+    if not seq.strip():
+        raise ValueError("Последовательность не может быть пустой")
+    # Убираем пробелы и переносы строк
+    return seq.replace("\n", "").replace(" ", "").upper()
+
+
 class Seq:
     """Класс для работы с биологических последовательностями."""
 
+    __slots__ = ("sequence", "header", "_counts")
+
     def __init__(self, seq, header=""):
-        if not seq.strip():
-            raise ValueError("Последовательность не может быть пустой")
-        # Убираем пробелы и переносы строк
-        self.sequence = seq.replace("\n", "").replace(" ", "").upper()
+        self.sequence = _normalize(seq)
         self.header = header
+        self._counts = None
+
+    @classmethod
+    def _from_normalized(cls, sequence, header=""):
+        """Seq из уже нормализованной строки, без проверки и копирования.
+
+        Для внутреннего использования: sequence должна быть непустой,
+        в верхнем регистре и без пробельных символов.
+        """
+        seq = cls.__new__(cls)
+        seq.sequence = sequence
+        seq.header = header
+        seq._counts = None
+        return seq
 
     def __str__(self):
         return f">{self.header}\n{self.sequence}"
@@ -18,22 +82,82 @@ class Seq:
     def __len__(self):
         return len(self.sequence)
 
+    def __getitem__(self, key):
+        return self.sequence[key]
+
+    def _histogram(self):
+        """Гистограмма символов; считается один раз при первом обращении."""
+        if self._counts is None:
+            self._counts = _count_residues(self.sequence)
+        return self._counts
+
+    def composition(self):
+        """Возвращает количество каждого символа последовательности."""
+        return dict(sorted(self._histogram().items()))
+
     def alphabet_type(self):
         """Определяет тип последовательности: DNA, RNA или PROTEIN."""
-        s = set(self.sequence)
-        if s.issubset(set("ATCG")):
-            return "DNA"
-        if s.issubset(set("AUCG")):
-            return "RNA"
-        if s.issubset(set("ACDEFGHIKLMNPQRSTVWY")):
-            return "PROTEIN"
-        return "UNKNOWN"
+        return _classify(self._histogram().keys())
 
     def gc_content(self):
         """Вычисляет процент GC для DNA/RNA."""
         atype = self.alphabet_type()
         if atype not in ("DNA", "RNA"):
             raise ValueError("GC-состав доступен только для DNA или RNA")
-        g = self.sequence.count("G")
-        c = self.sequence.count("C")
-        return round(100 * (g + c) / len(self.sequence), 2)
+        counts = self._histogram()
+        return round(100 * (counts.get("G", 0) + counts.get("C", 0)) / len(self), 2)
+
+    def _nucleotide_bytes(self, letters, action):
+        """Последовательность в байтах; ошибка, если в ней есть символы не из letters."""
+        invalid = self._histogram().keys() - letters
+        if invalid:
+            raise InvalidSequenceError(
+                f"{action} доступна только для нуклеотидных последовательностей",
+                invalid_chars=invalid,
+            )
+        return self.sequence.encode("ascii")
+
+    def _derived_header(self, suffix):
+        return f"{self.header} {suffix}" if self.header else suffix
+
+    def reverse_complement(self):
+        """Обратная комплементарная последовательность ДНК (с кодами IUPAC)."""
+        data = self._nucleotide_bytes(genetic_code.DNA_LETTERS, "Обратная комплементарность")
+        return Seq._from_normalized(genetic_code.reverse_complement(data).decode("ascii"),
+                                    self._derived_header("reverse complement"))
+
+    def translate(self, code=1):
+        """Трансляция ДНК/РНК в белок по генетическому коду NCBI номер code."""
+        data = self._nucleotide_bytes(genetic_code.NUCLEOTIDE_LETTERS, "Трансляция")
+        if len(data) % 3:
+            raise InvalidSequenceError("Длина последовательности для трансляции должна быть кратна 3")
+        return Seq._from_normalized(genetic_code.translate(data, code).decode("ascii"),
+                                    self._derived_header("translated"))
+
+    def translate_six_frames(self, code=1):
+        """Трансляция во всех шести рамках: словарь {1, 2, 3, -1, -2, -3} -> Seq.
+
+        Неполные кодоны в конце рамок отбрасываются; рамки короче кодона
+        в словарь не попадают.
+        """
+        data = self._nucleotide_bytes(genetic_code.NUCLEOTIDE_LETTERS, "Трансляция")
+        return {
+            frame: Seq._from_normalized(protein.decode("ascii"),
+                                        self._derived_header(f"frame {frame:+d}"))
+            for frame, protein in genetic_code.translate_six_frames(data, code).items()
+            if protein
+        }
+
+    def iter_orfs(self, min_length=75, code=1, alternative_starts=False):
+        """Генератор ORF (start, end, frame, seq) во всех шести рамках.
+
+        Длина ORF считается в нуклеотидах вместе со стоп-кодоном;
+        параметры — как у fasta_parser.orfs.iter_orfs.
+        """
+        data = self._nucleotide_bytes(genetic_code.DNA_LETTERS, "Поиск ORF")
+        for start, end, frame, seq in orfs.iter_orfs(data, min_length, code, alternative_starts):
+            yield start, end, frame, seq.decode("ascii")
+
+    def find_orfs(self, min_length=75, code=1, alternative_starts=False):
+        """Список ORF (start, end, frame, seq) длиной не меньше min_length."""
+        return list(self.iter_orfs(min_length, code, alternative_starts))
@@ -0,0 +1,133 @@
+"""
+Разбиение FASTA-файла на части с равным числом остатков или записей
+"""
+
+import errno
+import os
+from array import array
+
+from fasta_parser.fasta_reader import FastaReader, _read_blocks, _scan_records
+
+# Размер куска при копировании через чтение и запись
+_COPY_SIZE = 1 << 20
+
+# Ошибки, при которых системный вызов копирования не поддерживается
+# для этой пары файлов и нужно перейти к следующему способу
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def plan_shards(reader, n_shards, by="residues"):
+    """Границы частей: список n_shards пар (start, end) байтов файла.
+
+    Записи не перемешиваются и не режутся: часть — непрерывный диапазон
+    записей, а запись попадает в ту часть, на которую приходится её
+    середина по накопленному весу (числу остатков или записей). Файл
+    просматривается через _scan_records, тела записей не собираются.
+    """
+    if n_shards < 1:
+        raise ValueError("Число частей должно быть положительным")
+    if by not in ("residues", "records"):
+        raise ValueError(f"Неизвестный способ разбиения: {by}")
+    offsets = array("q")
+    weights = array("q")
+    end = 0
+    with reader._open() as f:
+        for offset, end, _, length in _scan_records(_read_blocks(f, reader.block_size)):
+            offsets.append(offset)
+            weights.append(length if by == "residues" else 1)
+    total = sum(weights) or 1
+    starts = []
+    done = 0
+    for offset, weight in zip(offsets, weights):
+        shard = min((2 * done + weight) * n_shards // (2 * total), n_shards - 1)
+        while len(starts) <= shard:
+            starts.append(offset)
+        done += weight
+    while len(starts) < n_shards:
+        starts.append(end)
+    return list(zip(starts, starts[1:] + [end]))
+
+
+def _copy_range(src, dst, start, length):
+    """Копирует length байтов src начиная с start в текущую позицию dst.
+
+    Сначала пробует os.copy_file_range, затем os.sendfile — данные не
+    проходят через память процесса; если ни один не поддерживается,
+    копирует кусками через os.pread.
+    """
+    for name in ("copy_file_range", "sendfile"):
+        copy = getattr(os, name, None)
+        if copy is None:
+            continue
+        try:
+            while length:
+                if name == "sendfile":
+                    n = copy(dst, src, start, length)
+                else:
+                    n = copy(src, dst, length, start)
+                if n == 0:
+                    break
+                start += n
+                length -= n
+            if not length:
+                return
+        except OSError as exc:
+            if exc.errno not in _UNSUPPORTED:
+                raise
+    while length:
+        data = os.pread(src, min(length, _COPY_SIZE), start)
+        if not data:
+            raise ValueError("Файл изменился во время разбиения")
+        os.write(dst, data)
+        start += len(data)
+        length -= len(data)
+
+
+def _copy_stream(f, dst, length):
+    """Копирует length байтов из потока f в dst (при dst=None — пропускает)."""
+    while length:
+        data = f.read(min(length, _COPY_SIZE))
+        if not data:
+            raise ValueError("Файл изменился во время разбиения")
+        if dst is not None:
+            dst.write(data)
+        length -= len(data)
+
+
+def _shard_paths(path, n_shards, output_dir):
+    """Имена частей: <имя>.part_001<расширение> рядом с файлом или в output_dir."""
+    name = os.path.basename(path)
+    if name.endswith(".gz"):
+        name = name[:-3]
+    stem, ext = os.path.splitext(name)
+    directory = output_dir or os.path.dirname(path) or "."
+    width = max(3, len(str(n_shards)))
+    return [os.path.join(directory, f"{stem}.part_{i + 1:0{width}d}{ext or '.fasta'}")
+            for i in range(n_shards)]
+
+
+def split_fasta(path, n_shards, by="residues", output_dir=None):
+    """Делит FASTA-файл path на n_shards частей; возвращает пути частей.
+
+    by="residues" выравнивает части по числу остатков, by="records" —
+    по числу записей. Границы частей находятся одним просмотром
+    заголовков и длин, а сами части копируются из файла целыми
+    диапазонами байтов: строки последовательностей не разбираются и не
+    переносятся заново. Сжатые gzip/BGZF файлы копируются из
+    распакованного потока, части пишутся несжатыми.
+    """
+    reader = FastaReader(path)
+    ranges = plan_shards(reader, n_shards, by)
+    paths = _shard_paths(path, n_shards, output_dir)
+    if reader.compression:
+        with reader._open() as f:
+            _copy_stream(f, None, ranges[0][0])
+            for shard_path, (start, end) in zip(paths, ranges):
+                with open(shard_path, "wb") as dst:
+                    _copy_stream(f, dst, end - start)
+        return paths
+    with open(path, "rb") as src:
+        for shard_path, (start, end) in zip(paths, ranges):
+            with open(shard_path, "wb") as dst:
+                _copy_range(src.fileno(), dst.fileno(), start, end - start)
+    return paths
@@ -0,0 +1,206 @@
+"""
+Треки состава по окнам: GC и GC-skew через накопленные суммы
+"""
+
+from array import array
+from itertools import accumulate, islice
+from math import gcd
+
+try:
+    import numpy as np
+except ImportError:  # numpy — необязательная зависимость
+    np = None
+
+from fasta_parser.fasta_reader import _UPPER, _WHITESPACE, _iter_fragments, _read_blocks
+
+# Основания, для которых хранятся накопленные суммы
+BASES = "GCATN"
+
+# Таблицы байт -> 1 для своего основания и 0 для остальных
+_INDICATORS = {
+    base: bytes(int(i == ord(base)) for i in range(256)) for base in BASES
+}
+
+# Суммы хранятся по 4 байта, пока запись не длиннее 2^32 - 1 остатков
+_SMALL_SUMS = "I"
+_SMALL_LIMIT = 1 << 32
+
+
+class CompositionTrack:
+    """Накопленные количества G, C, A, T и N одной записи.
+
+    Суммы хранятся в array через каждые resolution остатков (и в конце
+    записи), поэтому состав любого окна, границы которого кратны
+    resolution, считается за O(1) — разностью двух сумм. На точку
+    уходит 4 байта на основание (8 — для записей от 2^32 остатков).
+    """
+
+    def __init__(self, header, length, resolution, sums):
+        self.header = header
+        self.length = length
+        self.resolution = resolution
+        self.sums = sums
+
+    @classmethod
+    def from_seq(cls, seq, resolution=1):
+        """Трек по последовательности Seq."""
+        builder = _TrackBuilder(seq.header, resolution)
+        builder.feed(seq.sequence.encode("utf-8"))
+        return builder.finish()
+
+    @property
+    def name(self):
+        """Имя записи для bedGraph/wiggle — первое слово заголовка."""
+        fields = self.header.split()
+        return fields[0] if fields else ""
+
+    def __len__(self):
+        return self.length
+
+    def _index(self, pos):
+        if pos == self.length:
+            return len(self.sums["G"]) - 1
+        if pos % self.resolution or not 0 <= pos < self.length:
+            raise ValueError(
+                f"Граница окна {pos} должна быть кратна {self.resolution} и лежать в записи"
+            )
+        return pos // self.resolution
+
+    def counts(self, start, end):
+        """Количества G, C, A, T и N в окне [start, end)."""
+        i, j = self._index(start), self._index(end)
+        return {base: self.sums[base][j] - self.sums[base][i] for base in BASES}
+
+    def gc(self, start, end):
+        """Процент GC в окне [start, end), как в Seq.gc_content."""
+        i, j = self._index(start), self._index(end)
+        if end <= start:
+            return 0.0
+        gc = self.sums["G"][j] - self.sums["G"][i] + self.sums["C"][j] - self.sums["C"][i]
+        return round(100 * gc / (end - start), 2)
+
+    def skew(self, start, end):
+        """GC-skew (G - C) / (G + C) в окне [start, end); 0 без G и C."""
+        i, j = self._index(start), self._index(end)
+        g = self.sums["G"][j] - self.sums["G"][i]
+        c = self.sums["C"][j] - self.sums["C"][i]
+        return round((g - c) / (g + c), 4) if g + c else 0.0
+
+    def windows(self, window, step=None):
+        """Границы окон (start, end); последнее окно может быть короче."""
+        step = step or window
+        start = covered = 0
+        while start + window <= self.length:
+            yield start, start + window
+            covered = start + window
+            start += step
+        if covered < self.length and start < self.length:
+            yield start, self.length
+
+
+class _TrackBuilder:
+    """Собирает CompositionTrack из потока кусков записи."""
+
+    def __init__(self, header, resolution):
+        if resolution < 1:
+            raise ValueError("resolution должно быть положительным")
+        self.header = header
+        self.resolution = resolution
+        self.sums = {base: array(_SMALL_SUMS, [0]) for base in BASES}
+        self.buffer = bytearray()
+        self.length = 0
+
+    def feed(self, piece):
+        buffer = self.buffer
+        buffer += piece.translate(_UPPER, _WHITESPACE)
+        full = len(buffer) - len(buffer) % self.resolution
+        if full:
+            self._add(buffer, full)
+            del buffer[:full]
+
+    def _add(self, data, size):
+        """Дописывает суммы по первым size байтам data (size кратно resolution).
+
+        Каждое основание переводится одним translate в байты 0/1, и
+        накопленная сумма считается на C: через numpy.cumsum, а без
+        numpy — через accumulate, из которого берётся каждая
+        resolution-я точка.
+        """
+        if self.length + size >= _SMALL_LIMIT and self.sums["G"].typecode == _SMALL_SUMS:
+            self.sums = {base: array("q", sums) for base, sums in self.sums.items()}
+        r = self.resolution
+        data = bytes(data[:size])
+        for base, sums in self.sums.items():
+            indicator = data.translate(_INDICATORS[base])
+            if np is not None:
+                values = np.cumsum(np.frombuffer(indicator, dtype=np.uint8), dtype=np.int64)
+                values = values[r - 1::r] + sums[-1]
+                sums.frombytes(values.astype(sums.typecode).tobytes())
+            else:
+                sums.extend(islice(accumulate(indicator, initial=sums[-1]), r, None, r))
+        self.length += size
+
+    def finish(self):
+        if self.buffer:
+            # Хвост записи короче resolution — последняя точка сумм
+            size = len(self.buffer)
+            for base, sums in self.sums.items():
+                sums.append(sums[-1] + self.buffer.count(base.encode("ascii")))
+            self.length += size
+            self.buffer.clear()
+        return CompositionTrack(self.header, self.length, self.resolution, self.sums)
+
+
+def gc_track(reader, window, step=None, resolution=None):
+    """Генератор CompositionTrack по записям FastaReader.
+
+    Записи читаются потоком, без сборки последовательностей; по умолчанию
+    resolution = НОД(window, step), чтобы хватало точек для всех окон.
+    """
+    resolution = resolution or gcd(window, step or window)
+    builder = None
+    with reader._open() as f:
+        for header, piece in _iter_fragments(_read_blocks(f, reader.block_size)):
+            if header is None:
+                if builder is not None:
+                    builder.feed(piece)
+                continue
+            if builder is not None:
+                yield builder.finish()
+            header = header.decode("utf-8").rstrip()
+            # Записи с пустым заголовком пропускаются, как и при обычном чтении
+            builder = _TrackBuilder(header, resolution) if header else None
+    if builder is not None:
+        yield builder.finish()
+
+
+def _value(track, value, start, end):
+    if value == "gc":
+        return track.gc(start, end)
+    if value == "skew":
+        return track.skew(start, end)
+    raise ValueError(f"Неизвестная величина трека: {value}")
+
+
+def write_bedgraph(tracks, path, window, step=None, value="gc"):
+    """Записывает значения value ("gc" или "skew") по окнам в bedGraph."""
+    with open(path, "w", encoding="utf-8") as f:
+        for track in tracks:
+            name = track.name
+            f.writelines(
+                f"{name}\t{start}\t{end}\t{_value(track, value, start, end)}\n"
+                for start, end in track.windows(window, step)
+            )
+
+
+def write_wiggle(tracks, path, window, step=None, value="gc"):
+    """Записывает значения value по полным окнам в wiggle (fixedStep)."""
+    step = step or window
+    with open(path, "w", encoding="utf-8") as f:
+        for track in tracks:
+            f.write(f"fixedStep chrom={track.name} start=1 step={step} span={window}\n")
+            f.writelines(
+                f"{_value(track, value, start, end)}\n"
+                for start, end in track.windows(window, step)
+                if end - start == window
+            )
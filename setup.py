@@ -23,7 +23,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/username/fasta-parser",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Science/Research",
@@ -40,6 +40,9 @@ setup(
         # Никаких внешних зависимостей для основного функционала
     ],
     extras_require={
+        "numpy": [
+            "numpy>=1.17",
+        ],
         "dev": [
             "sphinx>=4.0.0",
             "sphinx-rtd-theme>=1.0.0",
@@ -6,18 +6,43 @@
 """
 
 import unittest
+import asyncio
 import os
+import gzip
+import struct
 import tempfile
 import sys
+import zlib
+from unittest import mock
 
 # Добавляем родительскую директорию в путь
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from fasta_parser import bgzf
 from fasta_parser.fasta_reader import FastaReader
+from fasta_parser.fasta_writer import FastaWriter
+from fasta_parser.batch import np
+from fasta_parser.cache import SequenceCache
+from fasta_parser.dedup import deduplicate
+from fasta_parser.kmers import kmer_counts
+from fasta_parser.metrics import ReaderMetrics
+from fasta_parser.multi_reader import MultiFastaReader
+from fasta_parser.orfs import find_orfs_parallel
+from fasta_parser.split import split_fasta
 from fasta_parser.seq import Seq
+from fasta_parser.tracks import CompositionTrack, gc_track, write_bedgraph
 from fasta_parser.exceptions import FastaFormatError
 
 
+def bgzf_block(data):
+    """Один блок BGZF с данными data."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+    header = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+    return (header + struct.pack("<H", len(cdata) + 25) + cdata
+            + struct.pack("<II", zlib.crc32(data), len(data)))
+
+
 class TestFastaReader(unittest.TestCase):
     """Тесты для класса FastaReader."""
     
@@ -104,12 +129,109 @@ AUGCGUACGUAGCUA
         self.assertEqual(len(sequences), 3)
         self.assertIsInstance(sequences[0], Seq)
     
+    def test_aiter(self):
+        """Тест асинхронного чтения из файла и из asyncio.StreamReader."""
+        reader = FastaReader(self.valid_fasta_file, block_size=7)
+        expected = [(seq.header, seq.sequence) for seq in reader]
+
+        async def read_file():
+            return [(seq.header, seq.sequence) async for seq in reader.aiter(read_ahead=2)]
+
+        async def read_stream():
+            stream = asyncio.StreamReader()
+            stream.feed_data(self.valid_fasta_content.encode())
+            stream.feed_eof()
+            return [(seq.header, seq.sequence)
+                    async for seq in FastaReader.aiter_stream(stream, block_size=5)]
+
+        self.assertEqual(asyncio.run(read_file()), expected)
+        self.assertEqual(asyncio.run(read_stream()), expected)
+
+    def test_reader_metrics(self):
+        """Тест счётчиков чтения и callback в конце прохода."""
+        snapshots = []
+        metrics = ReaderMetrics(callback=lambda m: snapshots.append(m.as_dict()))
+        reader = FastaReader(self.valid_fasta_file, block_size=8, metrics=metrics)
+        sequences = list(reader)
+
+        self.assertEqual(len(sequences), 3)
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(metrics.records, 3)
+        self.assertEqual(metrics.residues, 30 + 8 + 15)
+        self.assertEqual(metrics.bytes_read, len(self.valid_fasta_content))
+        self.assertEqual(metrics.max_record_header, "seq1 First DNA sequence")
+        self.assertGreaterEqual(metrics.construct_time, 0)
+
+        list(reader)
+        self.assertEqual(metrics.records, 6)
+        metrics.reset()
+        self.assertEqual(metrics.as_dict()["records"], 0)
+
     def test_get_sequence_count(self):
         """Тест подсчета количества последовательностей."""
         reader = FastaReader(self.valid_fasta_file)
         count = reader.get_sequence_count()
         self.assertEqual(count, 3)
     
+    def test_scan_headers(self):
+        """Тест просмотра заголовков и длин без загрузки последовательностей."""
+        reader = FastaReader(self.valid_fasta_file, block_size=5)
+        expected = [(seq.header, len(seq)) for seq in reader]
+        scanned = list(reader.scan_headers())
+        self.assertEqual([(header, length) for header, length, _ in scanned], expected)
+        self.assertEqual(scanned[0][2], 0)
+        self.assertEqual(scanned[1][2], self.valid_fasta_content.index(">seq2"))
+
+    def test_iter_records(self):
+        """Тест ленивых записей: последовательность читается по требованию."""
+        reader = FastaReader(self.valid_fasta_file, block_size=5)
+        expected = list(reader)
+        records = list(reader.iter_records())
+        self.assertEqual([(r.header, len(r)) for r in records],
+                         [(s.header, len(s)) for s in expected])
+        self.assertEqual([r.composition() for r in records],
+                         [s.composition() for s in expected])
+        self.assertIsNone(records[0]._sequence)
+        self.assertEqual([r.sequence for r in records], [s.sequence for s in expected])
+
+        long_ones = list(reader.filter_sequences(lambda r: len(r) > 20))
+        self.assertEqual([r.header for r in long_ones],
+                         [s.header for s in expected if len(s) > 20])
+        dna = list(reader.get_sequences_by_type("DNA"))
+        self.assertEqual([r.header for r in dna],
+                         [s.header for s in expected if s.alphabet_type() == "DNA"])
+
+        # В gzip и BGZF тела берутся за тот же проход, без перечитывания потока
+        gz_file = os.path.join(self.temp_dir, "records.fasta.gz")
+        with open(gz_file, "wb") as f:
+            f.write(gzip.compress(self.valid_fasta_content.encode()))
+        bgzf_file = os.path.join(self.temp_dir, "records.bgzf.fasta.gz")
+        with FastaWriter(bgzf_file, bgzf=True) as writer:
+            writer.write_all(expected)
+
+        def no_reread(start, end):
+            raise AssertionError("сжатый файл перечитывается")
+
+        for path, compression in ((gz_file, "gzip"), (bgzf_file, "bgzf")):
+            packed_reader = FastaReader(path, block_size=5)
+            self.assertEqual(packed_reader.compression, compression)
+            packed_reader._read_range = no_reread
+            records = list(packed_reader.iter_records())
+            self.assertEqual([(r.header, len(r), r.sequence, r.composition()) for r in records],
+                             [(s.header, len(s), s.sequence, s.composition()) for s in expected])
+            self.assertEqual([r.header for r in packed_reader.get_sequences_by_type("DNA")],
+                             [r.header for r in dna])
+
+        # Запись без последовательности отвергается, как и при обычной итерации
+        empty_file = os.path.join(self.temp_dir, "empty_record.fasta")
+        with open(empty_file, "w") as f:
+            f.write(">e\n>s1\nACGT\n")
+        empty_reader = FastaReader(empty_file)
+        with self.assertRaises(ValueError):
+            list(empty_reader)
+        with self.assertRaises(ValueError):
+            list(empty_reader.get_sequences_by_type("DNA"))
+
     def test_get_file_stats(self):
         """Тест сбора статистики файла."""
         reader = FastaReader(self.valid_fasta_file)
@@ -123,6 +245,21 @@ AUGCGUACGUAGCUA
         self.assertIn('RNA', stats['alphabet_types'])
         self.assertIn('PROTEIN', stats['alphabet_types'])
         
+    def test_get_file_stats_parallel(self):
+        """Тест совпадения параллельной и последовательной статистики."""
+        reader = FastaReader(self.valid_fasta_file, block_size=4)
+        self.assertEqual(reader.get_file_stats(workers=2), reader.get_file_stats())
+
+    def test_find_orfs_parallel(self):
+        """Тест поиска ORF по записям файла в пуле процессов."""
+        orf_file = os.path.join(self.temp_dir, "orfs.fasta")
+        with open(orf_file, "w") as f:
+            f.write(">gene1\nCCATGAAATTTGGATAACC\n>gene2\nAAATTTCCCGGG\n>gene3\nTTATCCAAATTTCAT\n")
+        reader = FastaReader(orf_file)
+        results = list(find_orfs_parallel(reader, min_length=12, workers=2))
+        self.assertEqual(results, [(seq.header, seq.find_orfs(12)) for seq in reader])
+        self.assertEqual(results[0][1], [(2, 17, 3, "ATGAAATTTGGATAA")])
+
     def test_get_sequence_by_id(self):
         """Тест поиска последовательности по идентификатору."""
         reader = FastaReader(self.valid_fasta_file)
@@ -140,6 +277,217 @@ AUGCGUACGUAGCUA
         not_found = reader.get_sequence_by_id("nonexistent")
         self.assertIsNone(not_found)
     
+    def test_header_index(self):
+        """Тест поиска через индекс заголовков .hidx."""
+        reader = FastaReader(self.valid_fasta_file)
+        reader.build_header_index()
+        self.assertTrue(os.path.exists(self.valid_fasta_file + ".hidx"))
+
+        reader = FastaReader(self.valid_fasta_file)
+        self.assertEqual(reader.get_sequence_by_id("seq2").sequence, "MKFGSTOP")
+        self.assertEqual(reader.get_sequence_by_id("protein").header,
+                         "seq2 Second protein sequence")
+        self.assertIsNone(reader.get_sequence_by_id("nonexistent"))
+        found = [seq.header for seq in reader.find_sequences("THIRD sequence")]
+        self.assertEqual(found, ["seq3 Third RNA sequence"])
+
+        # Изменённый файл — индекс перестраивается сам
+        with open(self.valid_fasta_file, "a") as f:
+            f.write(">seq4 Extra protein\nMKV\n")
+        self.assertEqual(reader.get_sequence_by_id("seq4").sequence, "MKV")
+        self.assertEqual(len(list(reader.find_sequences("protein"))), 2)
+
+    @unittest.skipIf(np is None, "numpy не установлен")
+    def test_iter_batches(self):
+        """Тест векторной статистики по пакетам записей."""
+        reader = FastaReader(self.valid_fasta_file)
+        batches = list(reader.iter_batches(batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+
+        first = batches[0]
+        self.assertEqual(first.headers[1], "seq2 Second protein sequence")
+        self.assertEqual(first.lengths().tolist(), [30, 8])
+        self.assertEqual(first[0].sequence, "ATGCGTACGTAGCTAACGTACGTACGTACG")
+
+        sequences = list(reader)
+        self.assertEqual(first.alphabet_types(), [s.alphabet_type() for s in sequences[:2]])
+        gc = batches[1].gc_content()
+        self.assertEqual(gc[0], sequences[2].gc_content())
+
+    @unittest.skipIf(np is None, "numpy не установлен")
+    def test_kmer_counts(self):
+        """Тест точного подсчёта k-меров с пропуском N и сбросом на диск."""
+        kmer_file = os.path.join(self.temp_dir, "kmers.fasta")
+        with open(kmer_file, "w") as f:
+            f.write(">a\nACGTNAC\ngt\n>b\nTTT\n")
+        reader = FastaReader(kmer_file)
+
+        self.assertEqual(kmer_counts(reader, 3, canonical=False),
+                         {"ACG": 2, "CGT": 2, "TTT": 1})
+        self.assertEqual(kmer_counts(reader, 3), {"ACG": 4, "AAA": 1})
+        # Маленький лимит памяти и куски — результат тот же
+        self.assertEqual(kmer_counts(reader, 2, memory_limit=16, chunk_size=2),
+                         kmer_counts(reader, 2))
+
+    def test_deduplicate(self):
+        """Тест удаления повторов с группами и сбросом дайджестов на диск."""
+        dup_file = os.path.join(self.temp_dir, "dups.fasta")
+        with open(dup_file, "w") as f:
+            f.write(">a\nACGT\n>b\nTTTT\n>c\nac\ngt\n>d\nTTTT\n>e\nGG\n>f\nACGT\n")
+        output = os.path.join(self.temp_dir, "unique.fasta")
+        groups = os.path.join(self.temp_dir, "groups.tsv")
+
+        for memory_limit in (1 << 30, 16):
+            stats = deduplicate(FastaReader(dup_file), output, groups, memory_limit=memory_limit)
+            self.assertEqual(stats, {"records": 6, "unique": 3, "duplicates": 3, "groups": 2})
+            self.assertEqual([seq.header for seq in FastaReader(output)], ["a", "b", "e"])
+            with open(groups) as f:
+                self.assertEqual(f.read(), "0\t0\ta\n1\t1\tb\n0\t2\tc\n1\t3\td\n0\t5\tf\n")
+
+    def test_split_fasta(self):
+        """Тест разбиения на части копированием диапазонов байтов."""
+        shard_file = os.path.join(self.temp_dir, "shards.fasta")
+        content = ">a\nACGTACGTAC\nGT\n>b\nAC\n>c\nACGT\n>d\nACGTAC\n>e\nGG\n"
+        with open(shard_file, "w") as f:
+            f.write(content)
+
+        paths = split_fasta(shard_file, 2)
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         ["shards.part_001.fasta", "shards.part_002.fasta"])
+        parts = []
+        for path in paths:
+            with open(path) as f:
+                parts.append(f.read())
+        self.assertEqual("".join(parts), content)
+        self.assertEqual([[seq.header for seq in FastaReader(p)] for p in paths],
+                         [["a"], ["b", "c", "d", "e"]])
+
+        paths = split_fasta(shard_file, 2, by="records")
+        self.assertEqual([[seq.header for seq in FastaReader(p)] for p in paths],
+                         [["a", "b"], ["c", "d", "e"]])
+
+    def test_multi_fasta_reader(self):
+        """Тест параллельного чтения нескольких файлов по порядку и по готовности."""
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir, f"sample{i}.fasta")
+            with open(path, "w") as f:
+                f.write("".join(f">s{i}_{j}\nACGT{'A' * j}\n" for j in range(5)))
+            paths.append(path)
+        expected = [(path, seq.header) for path in paths for seq in FastaReader(path)]
+
+        reader = MultiFastaReader(paths, workers=2, prefetch=1, batch_size=4)
+        self.assertEqual([(path, seq.header) for path, seq in reader], expected)
+        reader = MultiFastaReader(paths, workers=2, ordered=False)
+        self.assertEqual(sorted((path, seq.header) for path, seq in reader), sorted(expected))
+
+        missing = os.path.join(self.temp_dir, "missing.fasta")
+        with self.assertRaises(FileNotFoundError):
+            list(MultiFastaReader(paths + [missing], workers=2))
+
+    def test_sequence_cache(self):
+        """Тест кэша запросов: попадания, вытеснение по объёму и смена файла."""
+        cache = SequenceCache()
+        reader = FastaReader(self.valid_fasta_file, cache=cache)
+        first = reader.get_sequence_by_id("seq1")
+        self.assertIs(reader.get_sequence_by_id("seq1"), first)
+        fragment = reader.fetch("seq2", 2, 6)
+        self.assertEqual(fragment.sequence, reader.get_sequence_by_id("seq2").sequence[2:6])
+        self.assertIs(reader.fetch("seq2", 2, 6), fragment)
+        self.assertIsNone(reader.fetch("missing", 0, 1))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 4, 3))
+
+        # Изменённый файл — другой ключ
+        stat = os.stat(self.valid_fasta_file)
+        os.utime(self.valid_fasta_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNot(reader.get_sequence_by_id("seq1"), first)
+
+        # Кэш размером ровно с seq1: её добавление вытесняет остальные записи
+        one = SequenceCache()
+        FastaReader(self.valid_fasta_file, cache=one).get_sequence_by_id("seq1")
+        small = SequenceCache(max_bytes=one.size)
+        reader = FastaReader(self.valid_fasta_file, cache=small)
+        for seq_id in ("seq2", "seq3", "seq1"):
+            reader.get_sequence_by_id(seq_id)
+        stats = small.stats()
+        self.assertEqual((stats["entries"], stats["size"], stats["evictions"]), (1, one.size, 2))
+
+    def test_fai_index(self):
+        """Тест построения, сохранения и загрузки индекса .fai."""
+        reader = FastaReader(self.valid_fasta_file)
+        index = reader.build_index()
+
+        self.assertEqual(len(index), 3)
+        record = index["seq1"]
+        self.assertEqual(record.length, 30)
+        self.assertEqual(record.offset, len(">seq1 First DNA sequence\n"))
+        self.assertEqual(record.line_bases, 15)
+        self.assertEqual(record.line_width, 16)
+
+        reader.save_index()
+        self.assertTrue(os.path.exists(self.valid_fasta_file + ".fai"))
+        loaded = FastaReader(self.valid_fasta_file).load_index()
+        self.assertEqual(list(loaded), list(index))
+
+    def test_get_sequence_by_id_with_index(self):
+        """Тест поиска по идентификатору через индекс."""
+        FastaReader(self.valid_fasta_file).save_index()
+
+        # Индекс подхватывается автоматически
+        reader = FastaReader(self.valid_fasta_file)
+        seq = reader.get_sequence_by_id("seq1")
+        self.assertIsNotNone(reader.index)
+        self.assertEqual(seq.header, "seq1 First DNA sequence")
+        self.assertEqual(seq.sequence, "ATGCGTACGTAGCTAACGTACGTACGTACG")
+
+    def test_fai_irregular_lines(self):
+        """Тест ошибки индекса при разной длине строк."""
+        test_file = os.path.join(self.temp_dir, "irregular.fasta")
+        with open(test_file, 'w') as f:
+            f.write(">seq1\nATGC\nATGCGT\nAT\n")
+
+        with self.assertRaises(FastaFormatError):
+            FastaReader(test_file).build_index()
+
+    def test_gzip_input(self):
+        """Тест чтения FASTA, сжатого gzip."""
+        gz_file = os.path.join(self.temp_dir, "valid.fasta.gz")
+        with open(gz_file, 'wb') as f:
+            f.write(gzip.compress(self.valid_fasta_content.encode()))
+
+        reader = FastaReader(gz_file)
+        self.assertEqual(reader.compression, "gzip")
+        expected = [(s.header, s.sequence) for s in FastaReader(self.valid_fasta_file)]
+        self.assertEqual([(s.header, s.sequence) for s in reader], expected)
+
+    def test_bgzf_indexed_lookup(self):
+        """Тест чтения BGZF и поиска по индексу .fai + .gzi."""
+        data = self.valid_fasta_content.encode()
+        bgzf_file = os.path.join(self.temp_dir, "valid.fasta.bgz")
+        with open(bgzf_file, 'wb') as f:
+            # Маленькие блоки, чтобы записи пересекали границы блоков
+            for i in range(0, len(data), 10):
+                f.write(bgzf_block(data[i:i + 10]))
+            f.write(bgzf_block(b""))
+
+        reader = FastaReader(bgzf_file, threads=2)
+        self.assertEqual(reader.compression, "bgzf")
+        expected = [(s.header, s.sequence) for s in FastaReader(self.valid_fasta_file)]
+        self.assertEqual([(s.header, s.sequence) for s in reader], expected)
+
+        reader.save_index()
+        self.assertTrue(os.path.exists(bgzf_file + ".gzi"))
+        seq = FastaReader(bgzf_file).get_sequence_by_id("seq3")
+        self.assertEqual((seq.header, seq.sequence), expected[2])
+
+        # После seek распаковывается только блок позиции, без забегания вперёд
+        with mock.patch("fasta_parser.bgzf._inflate", wraps=bgzf._inflate) as inflate:
+            with bgzf.BgzfReader(bgzf_file, threads=2, index=reader.gzi) as raw:
+                raw.seek(25)
+                self.assertEqual(raw.read(5), data[25:30])
+        self.assertEqual(inflate.call_count, 1)
+
     def test_filter_sequences(self):
         """Тест фильтрации последовательностей."""
         reader = FastaReader(self.valid_fasta_file)
@@ -195,7 +543,33 @@ AUGCGUACGUAGCUA
         self.assertEqual(len(filtered_sequences), count)
         for seq in filtered_sequences:
             self.assertEqual(seq.get_alphabet_type(), "DNA")
-    
+
+    def test_fasta_writer(self):
+        """Тест записи с переносом строк и индексом .fai."""
+        output_file = os.path.join(self.temp_dir, "written.fasta")
+        seqs = [Seq("ATGC" * 5, "seq1 wrapped"), Seq("MKF", "seq2")]
+        with FastaWriter(output_file, line_width=8, index=True) as writer:
+            self.assertEqual(writer.write_all(seqs), 2)
+
+        with open(output_file) as f:
+            self.assertEqual(f.read(), ">seq1 wrapped\nATGCATGC\nATGCATGC\nATGC\n>seq2\nMKF\n")
+        reader = FastaReader(output_file)
+        written = reader.load_index()
+        self.assertEqual(list(written), list(reader.build_index()))
+
+    def test_fasta_writer_bgzf(self):
+        """Тест записи в BGZF с индексами .fai и .gzi."""
+        output_file = os.path.join(self.temp_dir, "written.fasta.gz")
+        seqs = list(FastaReader(self.valid_fasta_file))
+        with FastaWriter(output_file, line_width=10, bgzf=True, index=True) as writer:
+            writer.write_all(seqs)
+
+        self.assertTrue(os.path.exists(output_file + ".gzi"))
+        reader = FastaReader(output_file)
+        self.assertEqual(reader.compression, "bgzf")
+        self.assertEqual([s.sequence for s in reader], [s.sequence for s in seqs])
+        self.assertEqual(reader.get_sequence_by_id("seq3").sequence, seqs[2].sequence)
+
     def test_extract_subsequences(self):
         """Тест извлечения подпоследовательностей."""
         reader = FastaReader(self.valid_fasta_file)
@@ -208,6 +582,75 @@ AUGCGUACGUAGCUA
             self.assertIn("[0:10]", subseq.header)
 
 
+    def test_mapped_sequence(self):
+        """Тест последовательности, читаемой из mmap по индексу."""
+        reader = FastaReader(self.valid_fasta_file)
+        mapped = reader.get_mapped("seq1")
+        expected = "ATGCGTACGTAGCTAACGTACGTACGTACG"
+
+        self.assertEqual(mapped.header, "seq1 First DNA sequence")
+        self.assertEqual(len(mapped), 30)
+        # Срез пересекает перевод строки после 15-го остатка
+        self.assertEqual(mapped[10:20], expected[10:20])
+        self.assertEqual(mapped[-3:], expected[-3:])
+        self.assertEqual(mapped[::7], expected[::7])
+        self.assertEqual(mapped[15], "A")
+        self.assertEqual(mapped.sequence, expected)
+        self.assertIsNone(reader.get_mapped("nonexistent"))
+
+    def test_iter_windows(self):
+        """Тест потоковой нарезки записей на перекрывающиеся окна."""
+        reader = FastaReader(self.valid_fasta_file, block_size=4)
+        windows = [(h, start, w.sequence) for h, start, w in reader.iter_windows(12, 9)]
+        seq1 = "ATGCGTACGTAGCTAACGTACGTACGTACG"
+
+        self.assertEqual(windows[:3], [
+            ("seq1 First DNA sequence", 0, seq1[0:12]),
+            ("seq1 First DNA sequence", 9, seq1[9:21]),
+            ("seq1 First DNA sequence", 18, seq1[18:30]),
+        ])
+        # Запись короче окна даёт одно укороченное окно
+        self.assertEqual(windows[3], ("seq2 Second protein sequence", 0, "MKFGSTOP"))
+        self.assertEqual([start for h, start, _ in windows[4:]], [0, 9])
+        self.assertEqual(windows[-1][2], "UAGCUA")
+
+        full = [w for _, _, w in reader.iter_windows(10, partial=False)]
+        self.assertEqual([len(w) for w in full], [10, 10, 10, 10])
+        self.assertEqual(full[0].header, "seq1 First DNA sequence [0:10]")
+
+    def test_gc_track(self):
+        """Тест GC и GC-skew по окнам через накопленные суммы."""
+        reader = FastaReader(self.valid_fasta_file, block_size=4)
+        tracks = list(gc_track(reader, 10, 5))
+        seqs = list(reader)
+        self.assertEqual([t.length for t in tracks], [len(s) for s in seqs])
+
+        track, seq = tracks[0], seqs[0]
+        for start, end in track.windows(10, 5):
+            window = Seq(seq[start:end])
+            self.assertEqual(track.gc(start, end), window.gc_content())
+        self.assertEqual(track.counts(0, 30), {"G": 8, "C": 7, "A": 8, "T": 7, "N": 0})
+        self.assertEqual(CompositionTrack.from_seq(Seq("GGGC")).skew(0, 4), 0.5)
+        with self.assertRaises(ValueError):
+            track.gc(0, 7)
+
+        output_file = os.path.join(self.temp_dir, "gc.bedGraph")
+        write_bedgraph(tracks[:1], output_file, 10, 5)
+        with open(output_file) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[0], f"seq1\t0\t10\t{track.gc(0, 10)}")
+
+    def test_extract_subsequences_with_index(self):
+        """Тест извлечения фрагментов через индекс."""
+        reader = FastaReader(self.valid_fasta_file)
+        expected = [(s.header, s.sequence) for s in reader.extract_subsequences(12, 18)]
+
+        reader.build_index()
+        subseqs = [(s.header, s.sequence) for s in reader.extract_subsequences(12, 18)]
+        self.assertEqual(subseqs, expected)
+        self.assertEqual(subseqs[0], ("seq1 First DNA sequence [12:18]", "CTAACG"))
+
 class TestFastaReaderEdgeCases(unittest.TestCase):
     """Тесты граничных случаев для FastaReader."""
     
@@ -291,6 +734,48 @@ CGTAGCTA"""
         expected_sequence = "ATGCGTAGCGTACGTACGTAGCTA"
         self.assertEqual(sequences[0].sequence, expected_sequence)
 
+    def test_block_engine_matches_lines(self):
+        """Тест совпадения блочного и построчного движков разбора."""
+        fasta = """# комментарий до первой записи
+>seq1 First\r
+ATGCGTAG\r
+cgtacgta
+
+>seq2 Second
+MKFG
+>
+ACGT
+>seq3 Last
+AUGC
+GUAG"""
+        test_file = os.path.join(self.temp_dir, "engines.fasta")
+        with open(test_file, 'w', newline='') as f:
+            f.write(fasta)
+
+        expected = [(s.header, s.sequence)
+                    for s in FastaReader(test_file, engine="lines")]
+        self.assertEqual(len(expected), 3)
+        # Маленькие блоки заставляют записи пересекать границы блоков
+        for block_size in (1, 2, 5, 16, 1 << 20):
+            reader = FastaReader(test_file, engine="block", block_size=block_size)
+            self.assertEqual([(s.header, s.sequence) for s in reader], expected)
+
+    def test_block_engine_normalization(self):
+        """Тест нормализации тела записи в движке "block"."""
+        fasta_file = os.path.join(self.temp_dir, "raw.fasta")
+        with open(fasta_file, "wb") as f:
+            f.write(b">seq1\r\natg c\tgt\r\n>seq2\nacgu\xc3\xa9\n")
+        seqs = list(FastaReader(fasta_file))
+        self.assertEqual(seqs[0].sequence, "ATGCGT")
+        self.assertEqual(seqs[0].header, "seq1")
+        # Не-ASCII символы переводятся в верхний регистр так же, как в Seq
+        self.assertEqual(seqs[1].sequence, "ACGUÉ")
+
+    def test_unknown_engine(self):
+        """Тест обработки неизвестного движка разбора."""
+        with self.assertRaises(ValueError):
+            FastaReader("any.fasta", engine="regex")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -13,6 +13,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from fasta_parser.seq import Seq
+from fasta_parser.packed_seq import PackedSeq
 from fasta_parser.exceptions import InvalidSequenceError
 
 
@@ -97,6 +98,24 @@ class TestSeq(unittest.TestCase):
         expected = {'A': 2, 'T': 2, 'G': 3, 'C': 1}
         self.assertEqual(composition, expected)
         
+    def test_composition_cache(self):
+        """Тест однократного подсчёта состава последовательности."""
+        seq = Seq("ATGCGTAGNN", "Test")
+        self.assertIsNone(seq._counts)
+        self.assertEqual(seq.composition(), {'A': 2, 'C': 1, 'G': 3, 'N': 2, 'T': 2})
+        counts = seq._counts
+        self.assertEqual(seq.alphabet_type(), "PROTEIN")
+        # Гистограмма не пересчитывается при следующих вызовах
+        self.assertIs(seq._counts, counts)
+        self.assertEqual(Seq("AUGGCC").gc_content(), 66.67)
+
+    def test_from_normalized(self):
+        """Тест быстрого конструктора для уже нормализованных данных."""
+        seq = Seq._from_normalized("ATGC", "Trusted")
+        self.assertIsInstance(seq, Seq)
+        self.assertEqual((seq.sequence, seq.header), ("ATGC", "Trusted"))
+        self.assertEqual(seq.gc_content(), 50.0)
+
     def test_gc_content(self):
         """Тест вычисления GC-состава."""
         # ДНК: ATGCGTAG - 4 GC из 8 = 50%
@@ -150,6 +169,20 @@ class TestSeq(unittest.TestCase):
         with self.assertRaises(InvalidSequenceError):
             self.protein_seq.translate()
             
+    def test_translate_six_frames(self):
+        """Тест трансляции во всех шести рамках."""
+        frames = Seq("ATGAAATTTGGATAA", "Coding DNA").translate_six_frames()
+        self.assertEqual(sorted(frames), [-3, -2, -1, 1, 2, 3])
+        self.assertEqual(frames[1].sequence, "MKFG*")
+        self.assertEqual(frames[2].sequence, "*NLD")
+        self.assertEqual(frames[-1].sequence, "LSKFH")
+        self.assertIn("frame -1", frames[-1].header)
+        # Кодон с N транслируется как X, альтернативный код меняет стоп TGA
+        self.assertEqual(Seq("ATGNNNTGA").translate().sequence, "MX*")
+        self.assertEqual(Seq("ATGNNNTGA").translate(code=4).sequence, "MXW")
+        # В митохондриальном коде позвоночных TGA — W, а AGA и ATA — стоп и M
+        self.assertEqual(Seq("TGAAGAATA").translate(2).sequence, "W*M")
+
     def test_find_orfs(self):
         """Тест поиска открытых рамок считывания."""
         # Последовательность с ORF: ATGAAATTTGGATAA
@@ -173,6 +206,17 @@ class TestSeq(unittest.TestCase):
         with self.assertRaises(InvalidSequenceError):
             self.protein_seq.find_orfs()
 
+    def test_find_orfs_reverse_strand(self):
+        """Тест ORF на обратной цепи и в альтернативном генетическом коде."""
+        # Обратная комплементарная цепь ATGAAATTTGGATAA
+        orfs = Seq("TTATCCAAATTTCAT").find_orfs(min_length=12)
+        self.assertEqual(orfs, [(0, 15, -1, "ATGAAATTTGGATAA")])
+
+        # TGA — стоп в стандартном коде и триптофан в коде 4
+        seq = Seq("ATGTGAAAATAA")
+        self.assertEqual(seq.find_orfs(min_length=6), [(0, 6, 1, "ATGTGA")])
+        self.assertEqual(seq.find_orfs(min_length=6, code=4), [(0, 12, 1, "ATGTGAAAATAA")])
+
 
 class TestSeqEdgeCases(unittest.TestCase):
     """Тесты граничных случаев для класса Seq."""
@@ -211,5 +255,47 @@ class TestSeqEdgeCases(unittest.TestCase):
         self.assertEqual(amb_seq.get_gc_content(), 20.0)  # 2 из 10
 
 
+
+class TestPackedSeq(unittest.TestCase):
+    """Тесты для упакованных нуклеотидных последовательностей."""
+
+    def test_roundtrip(self):
+        """Тест распаковки в исходную последовательность."""
+        for raw in ("ATGCGTAG", "augcguagc", "ACGTNNNNNRYACGT", "A", "MKFG",
+                    "UUTT", "ACGTU", "ACGUT"):
+            packed = PackedSeq(raw, "Test")
+            plain = Seq(raw, "Test")
+            self.assertEqual(packed.sequence, plain.sequence)
+            self.assertEqual(str(packed), str(plain))
+            self.assertEqual(len(packed), len(plain))
+            self.assertEqual(packed.alphabet_type(), plain.alphabet_type())
+            self.assertEqual(packed.composition(), plain.composition())
+
+    def test_slicing(self):
+        """Тест срезов без распаковки всей последовательности."""
+        raw = "ACGTNNACGTRYACGTACGTAC"
+        packed = PackedSeq(raw)
+        for key in (slice(0, 4), slice(3, 9), slice(5, None), slice(None, None, 3),
+                    slice(None, None, -1), slice(-7, -2)):
+            self.assertEqual(packed[key], raw[key])
+        self.assertEqual(packed[4], "N")
+        self.assertEqual(packed[-1], "C")
+        with self.assertRaises(IndexError):
+            packed[len(raw)]
+
+    def test_gc_content(self):
+        """Тест GC-состава по упакованным данным."""
+        self.assertEqual(PackedSeq("ATGCGTAG").gc_content(), 50.0)
+        self.assertEqual(PackedSeq("AUGCGUAGCC").gc_content(), 60.0)
+        with self.assertRaises(ValueError):
+            PackedSeq("ATGCN").gc_content()
+
+    def test_compact_storage(self):
+        """Тест хранения по 2 бита на основание."""
+        packed = PackedSeq("ACGT" * 1000)
+        self.assertEqual(len(packed._packed), 1000)
+        self.assertIsNone(packed._exceptions)
+        self.assertFalse(hasattr(packed, "__dict__"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file